@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFERRED_MODULES = ("openai",)
+
+
+async def first_request(app) -> int:
+    body = json.dumps({"username": "cold-start", "password": "cold-start"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/authenticate",
+        "raw_path": b"/api/v1/authenticate",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+        "state": {},
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    statuses = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await app(scope, receive, send)
+    return statuses[0]
+
+
+async def measure_child() -> dict:
+    started = time.perf_counter()
+    import main
+
+    imported = time.perf_counter()
+    loaded = {name: name in sys.modules for name in DEFERRED_MODULES}
+    async with main.app.router.lifespan_context(main.app):
+        started_up = time.perf_counter()
+        status_code = await first_request(main.app)
+        first_response = time.perf_counter()
+
+    return {
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (started_up - imported) * 1000,
+        "first_request_ms": (first_response - started_up) * 1000,
+        "time_to_first_response_ms": (first_response - started) * 1000,
+        "first_status": status_code,
+        "loaded_at_import": loaded,
+    }
+
+
+def run_child(database_url: str, create_schema: bool) -> dict:
+    environment = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        DATABASE_CREATE_SCHEMA="true" if create_schema else "false",
+        AUTH_SECRET=os.getenv("AUTH_SECRET", "cold-start-benchmark"),
+        PASSWORD_HASH_WORKERS=os.getenv("PASSWORD_HASH_WORKERS", "0"),
+    )
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start_benchmark", "--child"],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def summarize(runs: list[dict], create_schema: bool) -> dict:
+    summary = {"create_schema": create_schema, "runs": len(runs), "first_status": runs[-1]["first_status"]}
+    for field in ("import_ms", "startup_ms", "first_request_ms", "time_to_first_response_ms", "process_ms"):
+        values = [run[field] for run in runs]
+        summary[f"{field}_median"] = round(statistics.median(values), 1)
+        summary[f"{field}_max"] = round(max(values), 1)
+    summary["loaded_at_import"] = runs[-1]["loaded_at_import"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker cold start: import time and time to first response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure_child())))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{directory}/cold_start.db"
+        run_child(database_url, create_schema=True)
+        results = [
+            summarize([run_child(database_url, create_schema) for _ in range(args.runs)], create_schema)
+            for create_schema in (False, True)
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+from benchmarks.fake_openai_server import create_fake_openai_app
+from benchmarks.sqlite_dataset import PASSWORD, seed, username
+from constants.configuration import Configuration
+
+FORMULAS = ["H2 + O2", "Na + Cl2", "CH4 + O2", "Fe + S", "Zn + HCl", "Mg + O2", "Al + Br2", "C3H8 + O2"]
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_fake_openai(latency_seconds: float):
+    import uvicorn
+
+    port = free_port()
+    fake_app = create_fake_openai_app(latency_seconds)
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, fake_app, f"http://127.0.0.1:{port}/v1"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def count_statements(engine, counter: Counter) -> None:
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+
+def scenarios(dataset: dict, prompts: int, batch_size: int) -> dict:
+    teacher_id = dataset["teacher_ids"][0]
+    student_ids = [
+        student_id
+        for student_id, assigned_teacher_id in dataset["assignments"].items()
+        if assigned_teacher_id == teacher_id
+    ]
+
+    def prompt(index: int) -> dict:
+        distinct = index % prompts
+        return {"prompt": f"{FORMULAS[distinct % len(FORMULAS)]} + X{distinct}"}
+
+    return {
+        "authenticate": lambda index, tokens: (
+            "POST", "/api/v1/authenticate", None,
+            {"username": username(student_ids[index % len(student_ids)]), "password": PASSWORD},
+        ),
+        "users_create": lambda index, tokens: (
+            "POST", "/api/v1/users", None,
+            {
+                "first_name": "Bench",
+                "last_name": "User",
+                "username": f"bench{index}",
+                "password": PASSWORD,
+                "user_type": "student",
+                "assigned_teacher_id": teacher_id,
+            },
+        ),
+        "grades_list": lambda index, tokens: (
+            "GET", "/api/v1/grades?limit=50", tokens["teacher"], None,
+        ),
+        "grades_create": lambda index, tokens: (
+            "POST", "/api/v1/grades", tokens["teacher"],
+            {"date": "2026-01-15T10:00:00", "student_id": student_ids[index % len(student_ids)], "score": 75},
+        ),
+        "grades_batch": lambda index, tokens: (
+            "POST", "/api/v1/grades/batch", tokens["teacher"],
+            [
+                {"date": "2026-01-15T10:00:00", "student_id": student_ids[(index + offset) % len(student_ids)], "score": 60}
+                for offset in range(batch_size)
+            ],
+        ),
+        "sessions_list": lambda index, tokens: (
+            "GET", "/api/v1/sessions?limit=50", tokens["teacher"], None,
+        ),
+        "sessions_create": lambda index, tokens: (
+            "POST", "/api/v1/sessions", tokens["students"][index % len(tokens["students"])][1],
+            {
+                "student_id": tokens["students"][index % len(tokens["students"])][0],
+                "length_minutes": 30,
+                "reactions_total": 4,
+            },
+        ),
+        "analytics_students": lambda index, tokens: (
+            "GET", "/api/v1/analytics/students", tokens["teacher"], None,
+        ),
+        "analytics_daily": lambda index, tokens: (
+            "GET", "/api/v1/analytics/students/daily", tokens["teacher"], None,
+        ),
+        "reaction_full": lambda index, tokens: (
+            "POST", "/api/v1/reaction/full", tokens["students"][0][1], prompt(index),
+        ),
+        "reaction_full_stream": lambda index, tokens: (
+            "POST", "/api/v1/reaction/full/stream", tokens["students"][0][1], prompt(index),
+        ),
+        "reaction_empirical": lambda index, tokens: (
+            "POST", "/api/v1/reaction/empirical", tokens["students"][0][1], prompt(index),
+        ),
+        "reaction_combined": lambda index, tokens: (
+            "POST", "/api/v1/reaction/combined", tokens["students"][0][1], prompt(index),
+        ),
+        "reaction_batch": lambda index, tokens: (
+            "POST", "/api/v1/reaction/batch", tokens["students"][0][1],
+            {"kind": "empirical", "prompts": [prompt(index + offset)["prompt"] for offset in range(batch_size)]},
+        ),
+    }, student_ids
+
+
+async def login(client, user_id: int) -> dict:
+    response = await client.post("/api/v1/authenticate", json={"username": username(user_id), "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_scenario(client, name: str, build, tokens: dict, requests: int, concurrency: int, counter: Counter) -> dict:
+    latencies = []
+    statuses = Counter()
+    indexes = iter(range(requests))
+
+    async def worker():
+        for index in indexes:
+            method, url, headers, body = build(index, tokens)
+            started = time.perf_counter()
+            response = await client.request(method, url, headers=headers, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+
+    counter.clear()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "sql_statements_per_request": round(counter["statements"] / requests, 2),
+    }
+
+
+async def run(args, database_url: str, openai_base_url: str) -> list[dict]:
+    import httpx
+    from main import create_app
+    from services.database_engine import DatabaseEngine
+
+    database_engine = DatabaseEngine(database_url)
+    database_engine.create_schema()
+    dataset = seed(
+        database_engine.engine,
+        teachers=args.teachers,
+        students_per_teacher=args.students_per_teacher,
+        grades_per_student=args.grades_per_student,
+        sessions_per_student=args.sessions_per_student,
+    )
+    database_engine.engine.dispose()
+
+    settings = type("BenchmarkSettings", (Configuration,), {
+        "SECRET_KEY": "benchmark",
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC_URL": None,
+        "DATABASE_CREATE_SCHEMA": False,
+        "OPENAI_AI_KEY": "benchmark",
+        "OPENAI_BASE_URL": openai_base_url,
+        "OPENAI_MAX_QUEUE": max(Configuration.OPENAI_MAX_QUEUE, args.concurrency),
+        "OPENAI_STUDENT_RATE_PER_MINUTE": 0,
+    })
+    app = create_app(settings)
+    builders, student_ids = scenarios(dataset, args.prompts, args.batch_size)
+    selected = args.scenarios or list(builders)
+    counter = Counter()
+
+    async with app.router.lifespan_context(app):
+        count_statements(app.state.database_engine.engine, counter)
+        count_statements(app.state.database_engine.async_engine.sync_engine, counter)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            tokens = {
+                "teacher": await login(client, dataset["teacher_ids"][0]),
+                "students": [(student_id, await login(client, student_id)) for student_id in student_ids[:10]],
+            }
+            return [
+                await run_scenario(client, name, builders[name], tokens, args.requests, args.concurrency, counter)
+                for name in selected
+            ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency, throughput and SQL statements per request for every API route")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", nargs="+", help="run only these scenarios")
+    parser.add_argument("--teachers", type=int, default=5)
+    parser.add_argument("--students-per-teacher", type=int, default=30)
+    parser.add_argument("--grades-per-student", type=int, default=40)
+    parser.add_argument("--sessions-per-student", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=20, help="grades per /api/v1/grades/batch request")
+    parser.add_argument("--prompts", type=int, default=20, help="distinct reaction prompts")
+    parser.add_argument("--openai-latency", type=float, default=0.05, help="fake OpenAI latency in seconds")
+    args = parser.parse_args()
+
+    server, thread, fake_app, openai_base_url = start_fake_openai(args.openai_latency)
+    try:
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(sys.stderr):
+            results = asyncio.run(run(args, f"sqlite:///{directory}/endpoint_benchmark.db", openai_base_url))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(json.dumps({
+        "requests_per_scenario": args.requests,
+        "concurrency": args.concurrency,
+        "openai_latency_seconds": args.openai_latency,
+        "openai_requests_total": fake_app.state.requests_total,
+        "scenarios": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
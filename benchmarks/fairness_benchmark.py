@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+from benchmarks.endpoint_benchmark import FORMULAS, login, percentile, start_fake_openai
+from benchmarks.sqlite_dataset import seed
+from constants.configuration import Configuration
+
+
+def summary(latencies: list[float], statuses: Counter) -> dict:
+    return {
+        "requests": sum(statuses.values()),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "max_ms": round(max(latencies), 2) if latencies else None,
+    }
+
+
+async def run(args, database_url: str, openai_base_url: str) -> dict:
+    import httpx
+    from main import create_app
+    from services.database_engine import DatabaseEngine
+
+    database_engine = DatabaseEngine(database_url)
+    database_engine.create_schema()
+    dataset = seed(
+        database_engine.engine,
+        teachers=1,
+        students_per_teacher=args.students + 1,
+        grades_per_student=1,
+        sessions_per_student=1,
+    )
+    database_engine.engine.dispose()
+
+    settings = type("BenchmarkSettings", (Configuration,), {
+        "SECRET_KEY": "benchmark",
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC_URL": None,
+        "DATABASE_CREATE_SCHEMA": False,
+        "OPENAI_AI_KEY": "benchmark",
+        "OPENAI_BASE_URL": openai_base_url,
+        "OPENAI_MAX_CONCURRENCY": args.max_concurrency,
+        "OPENAI_MAX_QUEUE": args.hog_concurrency + args.students,
+        "OPENAI_STUDENT_BURST": args.burst,
+        "OPENAI_STUDENT_RATE_PER_MINUTE": args.rate_per_minute,
+    })
+    app = create_app(settings)
+    rng = random.Random(42)
+    prompts = iter(range(10 ** 9))
+    hog_latencies, hog_statuses = [], Counter()
+    class_latencies, class_statuses = [], Counter()
+    classroom_done = asyncio.Event()
+
+    async def ask(client, headers: dict, latencies: list, statuses: Counter):
+        index = next(prompts)
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/v1/reaction/full",
+            headers=headers,
+            json={"prompt": f"{FORMULAS[index % len(FORMULAS)]} + X{index}"},
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] += 1
+        return response
+
+    async def hog(client, headers: dict) -> None:
+        while not classroom_done.is_set():
+            response = await ask(client, headers, hog_latencies, hog_statuses)
+            if response.status_code == 429:
+                await asyncio.sleep(0.05)
+
+    async def student(client, headers: dict) -> None:
+        await asyncio.sleep(rng.uniform(0, args.burst_window))
+        for _ in range(args.requests_per_student):
+            await ask(client, headers, class_latencies, class_statuses)
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            student_ids = dataset["student_ids"]
+            hog_headers = await login(client, student_ids[0])
+            class_headers = [await login(client, student_id) for student_id in student_ids[1:]]
+
+            hogs = [asyncio.create_task(hog(client, hog_headers)) for _ in range(args.hog_concurrency)]
+            await asyncio.sleep(args.hog_head_start)
+            started = time.perf_counter()
+            await asyncio.gather(*(student(client, headers) for headers in class_headers))
+            elapsed = time.perf_counter() - started
+            classroom_done.set()
+            await asyncio.gather(*hogs)
+
+    return {
+        "classroom_seconds": round(elapsed, 3),
+        "classroom": summary(class_latencies, class_statuses),
+        "hog": summary(hog_latencies, hog_statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reaction latency of a classroom while one student floods the API")
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--requests-per-student", type=int, default=3)
+    parser.add_argument("--burst-window", type=float, default=1.0, help="students start within this many seconds")
+    parser.add_argument("--think-time", type=float, default=0.5, help="maximum pause between a student's requests")
+    parser.add_argument("--hog-concurrency", type=int, default=64, help="parallel requests of the flooding student")
+    parser.add_argument("--hog-head-start", type=float, default=1.0, help="seconds the flood runs before the class")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="OPENAI_MAX_CONCURRENCY")
+    parser.add_argument("--burst", type=int, default=Configuration.OPENAI_STUDENT_BURST)
+    parser.add_argument("--rate-per-minute", type=float, default=Configuration.OPENAI_STUDENT_RATE_PER_MINUTE)
+    parser.add_argument("--openai-latency", type=float, default=1.0, help="fake OpenAI latency in seconds")
+    args = parser.parse_args()
+
+    server, thread, fake_app, openai_base_url = start_fake_openai(args.openai_latency)
+    try:
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(sys.stderr):
+            results = asyncio.run(run(args, f"sqlite:///{directory}/fairness_benchmark.db", openai_base_url))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(json.dumps({
+        "students": args.students,
+        "hog_concurrency": args.hog_concurrency,
+        "max_concurrency": args.max_concurrency,
+        "burst": args.burst,
+        "rate_per_minute": args.rate_per_minute,
+        "openai_latency_seconds": args.openai_latency,
+        "openai_requests_total": fake_app.state.requests_total,
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+COMBINED_RESPONSE = json.dumps({
+    "description": "Під час реакції утворюється безбарвний газ.",
+    "visual": {"rgba": [0.75, 0.39, 1.00, 0.45], "state": "g"},
+}, ensure_ascii=False)
+
+
+def create_fake_openai_app(
+    latency_seconds: float = 0.5,
+    response_text: str = "[0.75, 0.39, 1.00, 0.45, g]",
+    error_rate: float = 0.0,
+    error_status: int = 500,
+) -> FastAPI:
+    app = FastAPI()
+    app.state.requests_total = 0
+    app.state.errors_total = 0
+    app.state.latency_seconds = latency_seconds
+    app.state.error_rate = error_rate
+    app.state.error_status = error_status
+
+    @app.post("/fault")
+    async def fault(request: Request):
+        body = await request.json()
+        for name in ("latency_seconds", "error_rate", "error_status"):
+            if name in body:
+                setattr(app.state, name, body[name])
+        return {
+            "latency_seconds": app.state.latency_seconds,
+            "error_rate": app.state.error_rate,
+            "error_status": app.state.error_status,
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests_total += 1
+        latency_seconds = app.state.latency_seconds
+        if random.random() < app.state.error_rate:
+            app.state.errors_total += 1
+            await asyncio.sleep(latency_seconds)
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error", "code": None}},
+                status_code=app.state.error_status,
+            )
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        if body.get("stream"):
+            return StreamingResponse(
+                stream_chunks(
+                    completion_id,
+                    body.get("model", "gpt-4o-mini"),
+                    (body.get("stream_options") or {}).get("include_usage", False),
+                    latency_seconds,
+                ),
+                media_type="text/event-stream",
+            )
+        await asyncio.sleep(latency_seconds)
+        response_format = (body.get("response_format") or {}).get("type")
+        content = COMBINED_RESPONSE if response_format == "json_object" else response_text
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        }
+
+    async def stream_chunks(completion_id: str, model: str, include_usage: bool, latency_seconds: float):
+        words = response_text.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(latency_seconds / len(words))
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if index == 0 else f" {word}"},
+                    "finish_reason": None,
+                }],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        if include_usage:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": {"prompt_tokens": 100, "completion_tokens": len(words), "total_tokens": 100 + len(words)},
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds to wait before answering")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected failures")
+    args = parser.parse_args()
+    uvicorn.run(
+        create_fake_openai_app(args.latency, error_rate=args.error_rate, error_status=args.error_status),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
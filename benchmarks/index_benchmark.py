@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select
+
+from benchmarks import sqlite_dataset
+from constants.configuration import Configuration
+
+
+def build_queries():
+    from models.grade import Grade
+    from models.student import Student
+    from models.study_session import StudySession
+    from models.user import User
+
+    def grades_page(teacher_id, student_id):
+        return select(Grade.id, Grade.date, Grade.score).where(
+            Grade.grader_teacher_id == teacher_id,
+            Grade.score >= 50,
+        ).order_by(Grade.date.desc(), Grade.id.desc()).limit(100)
+
+    def grades_for_student(teacher_id, student_id):
+        return select(Grade.id, Grade.date, Grade.score).where(
+            Grade.grader_teacher_id == teacher_id,
+            Grade.graded_student_id == student_id,
+        ).order_by(Grade.date.desc(), Grade.id.desc()).limit(100)
+
+    def sessions_page(teacher_id, student_id):
+        return select(
+            StudySession.id, StudySession.date, Student.first_name, Student.last_name,
+        ).join(Student, StudySession.student_id == Student.id).where(
+            Student.assigned_teacher_id == teacher_id,
+        ).order_by(StudySession.date.desc(), StudySession.id.desc()).limit(100)
+
+    def sessions_for_student(teacher_id, student_id):
+        return select(StudySession.id, StudySession.date).join(
+            Student, StudySession.student_id == Student.id,
+        ).where(
+            Student.assigned_teacher_id == teacher_id,
+            StudySession.student_id == student_id,
+        ).order_by(StudySession.date.desc(), StudySession.id.desc()).limit(100)
+
+    def current_user(teacher_id, student_id):
+        return select(User).where(User.id == teacher_id)
+
+    return {
+        "grades_page": grades_page,
+        "grades_for_student": grades_for_student,
+        "sessions_page": sessions_page,
+        "sessions_for_student": sessions_for_student,
+        "current_user": current_user,
+    }
+
+
+def declared_indexes():
+    return [
+        index
+        for table in Configuration.BASE.metadata.sorted_tables
+        for index in table.indexes
+        if not index.unique
+    ]
+
+
+def measure(engine, queries, dataset, repeat: int) -> dict:
+    results = {}
+    with engine.connect() as connection:
+        for name, build in queries.items():
+            samples = []
+            for iteration in range(repeat):
+                teacher_id = dataset["teacher_ids"][iteration % len(dataset["teacher_ids"])]
+                student_id = next(
+                    student for student, teacher in dataset["assignments"].items() if teacher == teacher_id
+                )
+                started = time.perf_counter()
+                connection.execute(build(teacher_id, student_id)).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            results[name] = {
+                "p50_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query latency with and without the model indexes on SQLite")
+    parser.add_argument("--teachers", type=int, default=20)
+    parser.add_argument("--students-per-teacher", type=int, default=30)
+    parser.add_argument("--grades-per-student", type=int, default=100)
+    parser.add_argument("--sessions-per-student", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    sqlite_dataset.import_models()
+    queries = build_queries()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        Configuration.BASE.metadata.create_all(bind=engine)
+        for index in declared_indexes():
+            index.drop(bind=engine)
+
+        dataset = sqlite_dataset.seed(
+            engine,
+            teachers=args.teachers,
+            students_per_teacher=args.students_per_teacher,
+            grades_per_student=args.grades_per_student,
+            sessions_per_student=args.sessions_per_student,
+        )
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        without_indexes = measure(engine, queries, dataset, args.repeat)
+
+        for index in declared_indexes():
+            index.create(bind=engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        with_indexes = measure(engine, queries, dataset, args.repeat)
+        engine.dispose()
+
+    print(json.dumps({
+        "rows": {
+            "grades": args.teachers * args.students_per_teacher * args.grades_per_student,
+            "sessions": args.teachers * args.students_per_teacher * args.sessions_per_student,
+        },
+        "without_indexes": without_indexes,
+        "with_indexes": with_indexes,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+from benchmarks.endpoint_benchmark import login, percentile
+from benchmarks.sqlite_dataset import PASSWORD, seed, username
+from constants.configuration import Configuration
+
+
+def summary(latencies: list[float], statuses: Counter) -> dict:
+    return {
+        "requests": sum(statuses.values()),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 2) if latencies else None,
+        "max_ms": round(max(latencies), 2) if latencies else None,
+    }
+
+
+async def run_logins(args, workers: int, database_url: str) -> dict:
+    import httpx
+    from main import create_app
+    from services.database_engine import DatabaseEngine
+
+    database_engine = DatabaseEngine(database_url)
+    database_engine.create_schema()
+    dataset = seed(
+        database_engine.engine,
+        teachers=1,
+        students_per_teacher=args.users,
+        grades_per_student=1,
+        sessions_per_student=1,
+    )
+    database_engine.engine.dispose()
+
+    settings = type("BenchmarkSettings", (Configuration,), {
+        "SECRET_KEY": "benchmark",
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC_URL": None,
+        "DATABASE_CREATE_SCHEMA": False,
+        "PASSWORD_HASH_WORKERS": workers,
+        "PASSWORD_HASH_MAX_QUEUE": args.max_queue,
+    })
+    app = create_app(settings)
+    student_ids = dataset["student_ids"]
+    login_latencies, login_statuses = [], Counter()
+    probe_latencies, probe_statuses = [], Counter()
+    burst_done = asyncio.Event()
+
+    async def authenticate(client, index: int) -> None:
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/v1/authenticate",
+            json={"username": username(student_ids[index % len(student_ids)]), "password": PASSWORD},
+        )
+        login_latencies.append((time.perf_counter() - started) * 1000)
+        login_statuses[response.status_code] += 1
+
+    async def probe(client, headers: dict) -> None:
+        while not burst_done.is_set():
+            started = time.perf_counter()
+            response = await client.get("/api/v1/grades?limit=50", headers=headers)
+            probe_latencies.append((time.perf_counter() - started) * 1000)
+            probe_statuses[response.status_code] += 1
+            await asyncio.sleep(args.probe_interval)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            teacher_headers = await login(client, dataset["teacher_ids"][0])
+            probe_task = asyncio.create_task(probe(client, teacher_headers))
+            await asyncio.sleep(args.probe_interval * 5)
+
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited(index: int) -> None:
+                async with semaphore:
+                    await authenticate(client, index)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(index) for index in range(args.logins)))
+            elapsed = time.perf_counter() - started
+            burst_done.set()
+            await probe_task
+
+    return {
+        "workers": workers,
+        "max_queue": app.state.password_hasher.max_queue,
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(login_statuses[200] / elapsed, 1),
+        "authenticate": summary(login_latencies, login_statuses),
+        "grades_during_burst": summary(probe_latencies, probe_statuses),
+    }
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        description="Login burst against /api/v1/authenticate and the latency of an unrelated route meanwhile",
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({0, 1, 2, 4, cpu_count}))
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=80, help="parallel login requests")
+    parser.add_argument("--users", type=int, default=20, help="seeded students the logins cycle through")
+    parser.add_argument("--max-queue", type=int, default=Configuration.PASSWORD_HASH_MAX_QUEUE)
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="pause between GET /api/v1/grades probes")
+    args = parser.parse_args()
+
+    results = []
+    with redirect_stdout(sys.stderr):
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as directory:
+                results.append(asyncio.run(run_logins(args, workers, f"sqlite:///{directory}/login_benchmark.db")))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
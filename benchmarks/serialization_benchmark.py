@@ -0,0 +1,141 @@
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from benchmarks.sqlite_dataset import seed
+from pydantics.grade_pydantic import GradePydantic
+from pydantics.session_pydantic import SessionPydantic
+from services import fast_json_response
+from services.fast_json_response import FastJSONResponse
+from services.row_serializer import RowSerializer
+
+
+def response_model_path(adapter: TypeAdapter, build_items):
+    def serialize(rows) -> bytes:
+        page = adapter.validate_python({"items": build_items(rows), "next_cursor": None})
+        return adapter.dump_json(page)
+    return serialize
+
+
+def stdlib_json_path(adapter: TypeAdapter, build_items):
+    def serialize(rows) -> bytes:
+        page = adapter.validate_python({"items": build_items(rows), "next_cursor": None})
+        return json.dumps(jsonable_encoder(page), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return serialize
+
+
+def fast_path(serializer: RowSerializer, use_orjson: bool = True):
+    def serialize(rows) -> bytes:
+        orjson = fast_json_response.orjson
+        if not use_orjson:
+            fast_json_response.orjson = None
+        try:
+            return FastJSONResponse({"items": serializer.items(rows), "next_cursor": None}).body
+        finally:
+            fast_json_response.orjson = orjson
+    return serialize
+
+
+def measure(serialize, rows, repeat: int) -> tuple[float, bytes]:
+    body = serialize(rows)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row serialization cost of the grade and session list responses")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from main import grades_query, sessions_query
+    from models.grade import Grade
+    from models.study_session import StudySession
+    from services.database_engine import DatabaseEngine
+
+    students = 100
+    per_student = -(-max(args.rows) // students)
+    endpoints = {
+        "grades": (
+            lambda teacher_id, limit: grades_query(teacher_id, GradePydantic.GradeFilter()).order_by(
+                Grade.date.desc(), Grade.id.desc(),
+            ).limit(limit),
+            TypeAdapter(GradePydantic.GradePage),
+            lambda rows: [row._asdict() for row in rows],
+            RowSerializer(GradePydantic.GradeResponse),
+        ),
+        "sessions": (
+            lambda teacher_id, limit: sessions_query(teacher_id, SessionPydantic.SessionFilter()).order_by(
+                StudySession.date.desc(), StudySession.id.desc(),
+            ).limit(limit),
+            TypeAdapter(SessionPydantic.SessionPage),
+            lambda rows: [
+                {
+                    "session_id": row.session_id,
+                    "date": row.date,
+                    "student_id": row.student_id,
+                    "length_minutes": row.length_minutes,
+                    "reactions_total": row.reactions_total,
+                    "student_name": row.student_name,
+                }
+                for row in rows
+            ],
+            RowSerializer(SessionPydantic.SessionResponseExtended),
+        ),
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        database_engine = DatabaseEngine(f"sqlite:///{directory}/serialization_benchmark.db")
+        database_engine.create_schema()
+        dataset = seed(
+            database_engine.engine,
+            teachers=1,
+            students_per_teacher=students,
+            grades_per_student=per_student,
+            sessions_per_student=per_student,
+        )
+        teacher_id = dataset["teacher_ids"][0]
+
+        for name, (query, adapter, build_items, serializer) in endpoints.items():
+            paths = {
+                "response_model": response_model_path(adapter, build_items),
+                "response_model_stdlib_json": stdlib_json_path(adapter, build_items),
+                "fast_path": fast_path(serializer),
+                "fast_path_stdlib_json": fast_path(serializer, use_orjson=False),
+            }
+            for limit in args.rows:
+                with database_engine.engine.connect() as connection:
+                    started = time.perf_counter()
+                    rows = connection.execute(query(teacher_id, limit)).all()
+                    fetch_seconds = time.perf_counter() - started
+
+                bodies = {}
+                result = {
+                    "endpoint": name,
+                    "rows": len(rows),
+                    "fetch_us_per_row": round(fetch_seconds / len(rows) * 1e6, 3),
+                }
+                for path, serialize in paths.items():
+                    seconds, bodies[path] = measure(serialize, rows, args.repeat)
+                    result[f"{path}_ms"] = round(seconds * 1000, 1)
+                    result[f"{path}_us_per_row"] = round(seconds / len(rows) * 1e6, 3)
+                result["speedup"] = round(result["response_model_ms"] / result["fast_path_ms"], 2)
+                result["identical_body"] = bodies["fast_path"] == bodies["response_model"] == bodies["fast_path_stdlib_json"]
+                results.append(result)
+        database_engine.engine.dispose()
+
+    print(json.dumps({"orjson": fast_json_response.orjson is not None, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import random
+from datetime import datetime, timedelta
+
+from passlib.context import CryptContext
+from sqlalchemy import insert
+
+from constants.configuration import Configuration
+from constants.user_type import UserType
+
+PASSWORD = "benchmark-password"
+
+
+def username(user_id: int) -> str:
+    return f"user{user_id}"
+
+
+def import_models():
+    from models import user, user_auth, student, teacher, grade, study_session, reaction_result
+    from models import student_rollup, student_daily_rollup, teacher_data_version
+
+
+def seed(
+    engine,
+    teachers: int = 10,
+    students_per_teacher: int = 30,
+    grades_per_student: int = 40,
+    sessions_per_student: int = 60,
+    seed_value: int = 42,
+) -> dict:
+    import_models()
+    from models.user import User
+    from models.student import Student
+    from models.teacher import Teacher
+    from models.user_auth import UserAuth
+    from models.grade import Grade
+    from models.study_session import StudySession
+
+    rng = random.Random(seed_value)
+    password_hash = CryptContext(schemes=[Configuration.CRYPT_SCHEME]).hash(PASSWORD)
+    start = datetime(2025, 9, 1)
+
+    teacher_ids = list(range(1, teachers + 1))
+    student_ids = list(range(teachers + 1, teachers + 1 + teachers * students_per_teacher))
+    users = [
+        {"id": user_id, "first_name": f"Teacher{user_id}", "last_name": "Benchmark", "user_type": UserType.TEACHER}
+        for user_id in teacher_ids
+    ] + [
+        {"id": user_id, "first_name": f"Student{user_id}", "last_name": "Benchmark", "user_type": UserType.STUDENT}
+        for user_id in student_ids
+    ]
+    assignments = {
+        student_id: teacher_ids[index // students_per_teacher]
+        for index, student_id in enumerate(student_ids)
+    }
+
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), users)
+        connection.execute(insert(Teacher.__table__), [{"id": user_id} for user_id in teacher_ids])
+        connection.execute(
+            insert(Student.__table__),
+            [{"id": student_id, "assigned_teacher_id": teacher_id} for student_id, teacher_id in assignments.items()],
+        )
+        connection.execute(
+            insert(UserAuth.__table__),
+            [
+                {"user_id": user["id"], "username": username(user["id"]), "password_hash": password_hash}
+                for user in users
+            ],
+        )
+
+        for student_id, teacher_id in assignments.items():
+            connection.execute(insert(Grade.__table__), [
+                {
+                    "date": start + timedelta(minutes=rng.randrange(0, 60 * 24 * 270)),
+                    "score": rng.randrange(0, 101),
+                    "comments": None,
+                    "graded_student_id": student_id,
+                    "grader_teacher_id": teacher_id,
+                }
+                for _ in range(grades_per_student)
+            ])
+            connection.execute(insert(StudySession.__table__), [
+                {
+                    "date": start + timedelta(minutes=rng.randrange(0, 60 * 24 * 270)),
+                    "student_id": student_id,
+                    "length_minutes": rng.randrange(5, 120),
+                    "reactions_total": rng.randrange(0, 40),
+                }
+                for _ in range(sessions_per_student)
+            ])
+
+    return {
+        "teacher_ids": teacher_ids,
+        "student_ids": student_ids,
+        "assignments": assignments,
+    }
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+from benchmarks.endpoint_benchmark import FORMULAS, login, percentile, start_fake_openai
+from benchmarks.sqlite_dataset import seed
+from constants.configuration import Configuration
+
+
+async def run_phase(client, app, fake_app, name: str, headers: dict, first_prompt: int, args) -> dict:
+    openai_client = app.state.openai_client
+    latencies = []
+    statuses = Counter()
+    indexes = iter(range(first_prompt, first_prompt + args.requests))
+    requests_before = fake_app.state.requests_total
+    retries_before = openai_client.retries
+    rejections_before = openai_client.circuit_breaker.rejections
+
+    async def worker():
+        for index in indexes:
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/reaction/full",
+                headers=headers,
+                json={"prompt": f"{FORMULAS[index % len(FORMULAS)]} + X{index}"},
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "phase": name,
+        "openai_latency_seconds": fake_app.state.latency_seconds,
+        "openai_error_rate": fake_app.state.error_rate,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "openai_requests": fake_app.state.requests_total - requests_before,
+        "retries": openai_client.retries - retries_before,
+        "circuit_rejections": openai_client.circuit_breaker.rejections - rejections_before,
+        "circuit_state": openai_client.circuit_breaker.state.value,
+    }
+
+
+async def run(args, database_url: str, fake_app, openai_base_url: str) -> list[dict]:
+    import httpx
+    from main import create_app
+    from services.database_engine import DatabaseEngine
+
+    database_engine = DatabaseEngine(database_url)
+    database_engine.create_schema()
+    dataset = seed(database_engine.engine, teachers=1, students_per_teacher=1, grades_per_student=1, sessions_per_student=1)
+    database_engine.engine.dispose()
+
+    settings = type("BenchmarkSettings", (Configuration,), {
+        "SECRET_KEY": "benchmark",
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC_URL": None,
+        "DATABASE_CREATE_SCHEMA": False,
+        "OPENAI_AI_KEY": "benchmark",
+        "OPENAI_BASE_URL": openai_base_url,
+        "OPENAI_MAX_QUEUE": max(Configuration.OPENAI_MAX_QUEUE, args.concurrency),
+        "OPENAI_STUDENT_RATE_PER_MINUTE": 0,
+        "OPENAI_TIMEOUT_SECONDS": args.timeout,
+        "OPENAI_DEADLINE_SECONDS": args.timeout * 3,
+        "OPENAI_CIRCUIT_OPEN_SECONDS": args.open_seconds,
+    })
+    app = create_app(settings)
+    phases = [
+        ("healthy", args.latency, 0.0),
+        ("outage", args.outage_latency, args.outage_error_rate),
+        ("open", args.outage_latency, args.outage_error_rate),
+        ("half_open", args.latency, 0.0),
+        ("recovered", args.latency, 0.0),
+    ]
+    results = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            headers = await login(client, dataset["student_ids"][0])
+            for index, (name, latency, error_rate) in enumerate(phases):
+                if name == "half_open":
+                    await asyncio.sleep(args.open_seconds)
+                fake_app.state.latency_seconds = latency
+                fake_app.state.error_rate = error_rate
+                results.append(await run_phase(client, app, fake_app, name, headers, index * args.requests, args))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reaction endpoint behaviour while the OpenAI API fails and recovers")
+    parser.add_argument("--requests", type=int, default=100, help="requests per phase, each with a new prompt")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake OpenAI latency while healthy")
+    parser.add_argument("--outage-latency", type=float, default=0.05, help="fake OpenAI latency during the outage")
+    parser.add_argument("--outage-error-rate", type=float, default=1.0, help="fraction of failing calls during the outage")
+    parser.add_argument("--timeout", type=float, default=1.0, help="OPENAI_TIMEOUT_SECONDS")
+    parser.add_argument("--open-seconds", type=float, default=2.0, help="OPENAI_CIRCUIT_OPEN_SECONDS")
+    args = parser.parse_args()
+
+    server, thread, fake_app, openai_base_url = start_fake_openai(args.latency)
+    try:
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(sys.stderr):
+            results = asyncio.run(run(args, f"sqlite:///{directory}/upstream_failure_benchmark.db", fake_app, openai_base_url))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(json.dumps({
+        "requests_per_phase": args.requests,
+        "concurrency": args.concurrency,
+        "phases": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
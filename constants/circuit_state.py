@@ -0,0 +1,6 @@
+from enum import Enum
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
@@ -7,11 +7,52 @@ class Configuration:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 60
     CRYPT_SCHEME = "pbkdf2_sha256"
+    CRYPT_ROUNDS = int(os.getenv("CRYPT_ROUNDS", "0")) or None
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "16"))
+    PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    SESSION_COMMIT_MODE = os.getenv("SESSION_COMMIT_MODE", "strict")
+    SESSION_FLUSH_INTERVAL_MS = int(os.getenv("SESSION_FLUSH_INTERVAL_MS", "50"))
+    SESSION_FLUSH_MAX_ROWS = int(os.getenv("SESSION_FLUSH_MAX_ROWS", "200"))
+    SESSION_BUFFER_MAX_PENDING = int(os.getenv("SESSION_BUFFER_MAX_PENDING", "10000"))
+    GRADE_BATCH_MAX_ITEMS = int(os.getenv("GRADE_BATCH_MAX_ITEMS", "500"))
+    USER_BULK_MAX_ITEMS = int(os.getenv("USER_BULK_MAX_ITEMS", "5000"))
+    USER_BULK_BATCH_ROWS = int(os.getenv("USER_BULK_BATCH_ROWS", "500"))
+    EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))
     OPENAI_AI_KEY = os.getenv("OPENAI_API_KEY")
-    DATABASE_CONNECTION_PARAMETERS = (
+    OPENAI_MODEL = "gpt-4o-mini"
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+    OPENAI_MAX_QUEUE = int(os.getenv("OPENAI_MAX_QUEUE", "64"))
+    OPENAI_STUDENT_BURST = int(os.getenv("OPENAI_STUDENT_BURST", "20"))
+    OPENAI_STUDENT_RATE_PER_MINUTE = float(os.getenv("OPENAI_STUDENT_RATE_PER_MINUTE", "20"))
+    OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+    OPENAI_DEADLINE_SECONDS = float(os.getenv("OPENAI_DEADLINE_SECONDS", "45"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_RETRY_BASE_DELAY_SECONDS = float(os.getenv("OPENAI_RETRY_BASE_DELAY_SECONDS", "0.25"))
+    OPENAI_CIRCUIT_FAILURE_RATIO = float(os.getenv("OPENAI_CIRCUIT_FAILURE_RATIO", "0.5"))
+    OPENAI_CIRCUIT_WINDOW = int(os.getenv("OPENAI_CIRCUIT_WINDOW", "20"))
+    OPENAI_CIRCUIT_MIN_CALLS = int(os.getenv("OPENAI_CIRCUIT_MIN_CALLS", "10"))
+    OPENAI_CIRCUIT_OPEN_SECONDS = float(os.getenv("OPENAI_CIRCUIT_OPEN_SECONDS", "30"))
+    REACTION_STRUCTURED_MAX_ATTEMPTS = int(os.getenv("REACTION_STRUCTURED_MAX_ATTEMPTS", "3"))
+    REACTION_BATCH_MAX_ITEMS = int(os.getenv("REACTION_BATCH_MAX_ITEMS", "50"))
+    REACTION_BATCH_CONCURRENCY = int(os.getenv("REACTION_BATCH_CONCURRENCY", "8"))
+    REACTION_CACHE_MAX_ENTRIES = int(os.getenv("REACTION_CACHE_MAX_ENTRIES", "2048"))
+    REACTION_CACHE_TTL_SECONDS = float(os.getenv("REACTION_CACHE_TTL_SECONDS", "3600"))
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    DATABASE_ASYNC_URL = os.getenv("DATABASE_ASYNC_URL")
+    DATABASE_CONNECTION_PARAMETERS = os.getenv("DATABASE_CONNECTION_PARAMETERS", (
         "Driver={ODBC Driver 17 for SQL Server};"
         "Server=localhost\\BACHELOR;"
         "Database=BACHELOR;"
         "Trusted_Connection=yes;"
-    )
+    ))
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+    DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DATABASE_CREATE_SCHEMA = os.getenv("DATABASE_CREATE_SCHEMA", "false").lower() in ("1", "true", "yes")
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
     
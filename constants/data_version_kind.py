@@ -0,0 +1,5 @@
+from enum import Enum
+
+class DataVersionKind(str, Enum):
+    GRADES = "grades"
+    SESSIONS = "sessions"
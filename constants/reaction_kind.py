@@ -0,0 +1,6 @@
+from enum import Enum
+
+class ReactionKind(str, Enum):
+    FULL = "full"
+    EMPIRICAL = "empirical"
+    COMBINED = "combined"
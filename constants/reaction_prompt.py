@@ -0,0 +1,40 @@
+from constants.reaction_kind import ReactionKind
+
+class ReactionPrompt:
+    FULL = (
+        "Ти вчитель хімії. Коротко опиши одним коротким абзацом ось цю реакцію,"
+        " надай повну формулу й врахуй, що відповідь повинна бути зрозуміла учням і студентам із ООП (надай чіткий, професійний"
+        " і достатньо серйозний проте елегантний опис, із використанням опису багатьох емпіричних властивостей речовини"
+        " на виході реакції: її хімічні та фізичні властивості тощо). Не використовуй у відповіді "
+        "символів, які можуть погано відображатися (типу markdown, піднесення до степеня тощо):{formula}"
+    )
+    EMPIRICAL = (
+        "Provide array of RGBa color values in float based on"
+        " the reaction provided (chose realistically) and a single letter: 'p' when reaction creates precipitate; "
+        "'l' when reaction creates liquid; and 'g' when reaction creates gas - only one of those letters,"
+        "state combinations are not allowed. 'a' in RGBa determines transparency - it should not be lower "
+        "than 0.10. Your response should contain ONLY the array value as plain value,"
+        " no additional markdown or anything else, in one line. Always add zeros for floats till value "
+        "has two numbers after '.' Example: ```[0.75, 0.39, 1.00, 0.45, g]```. The formula:{formula}"
+    )
+
+    COMBINED = (
+        "You are a chemistry teacher. Answer with a single JSON object and nothing else, in exactly this shape: "
+        '{{"description": "...", "visual": {{"rgba": [0.75, 0.39, 1.00, 0.45], "state": "g"}}}}. '
+        "'description' is one short paragraph in Ukrainian that describes the reaction, gives the full formula and is"
+        " clear to school and university students (a precise, professional and elegant description that covers many"
+        " empirical properties of the reaction products: their chemical and physical properties and so on); do not use"
+        " markdown, superscripts or other symbols that may render poorly. 'rgba' is four floats from 0 to 1 with the"
+        " realistic color of the reaction result, and 'a' (transparency) must not be lower than 0.10. 'state' is a single"
+        " letter: 'p' when the reaction creates a precipitate, 'l' when it creates a liquid and 'g' when it creates a gas;"
+        " combinations are not allowed. The formula:{formula}"
+    )
+
+    @staticmethod
+    def build(kind: ReactionKind, formula: str) -> str:
+        template = {
+            ReactionKind.FULL: ReactionPrompt.FULL,
+            ReactionKind.EMPIRICAL: ReactionPrompt.EMPIRICAL,
+            ReactionKind.COMBINED: ReactionPrompt.COMBINED,
+        }[kind]
+        return template.format(formula=formula)
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class SessionCommitMode(str, Enum):
+    STRICT = "strict"
+    GROUP = "group"
+    WRITE_BEHIND = "write_behind"
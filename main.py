@@ -1,21 +1,51 @@
-import openai
+import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Union
-from fastapi import FastAPI, Depends, HTTPException, status
+from typing import AsyncIterator, Union
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 
 from constants.configuration import Configuration
-from services.database_engine import DatabaseEngine
+from constants.data_version_kind import DataVersionKind
+from constants.export_format import ExportFormat
+from constants.reaction_kind import ReactionKind
+from constants.session_commit_mode import SessionCommitMode
+from constants.user_type import UserType
 from models.user import User
 from models.student import Student
 from models.teacher import Teacher
 from models.grade import Grade
 from models.study_session import StudySession
+from models.student_rollup import StudentRollup
+from models.student_daily_rollup import StudentDailyRollup
 from models.user_auth import UserAuth
+from services.circuit_breaker import CircuitBreaker
+from services.data_version_service import DataVersionService
+from services.database_engine import DatabaseEngine
+from services.fair_scheduler import FairScheduler
+from services.fast_json_response import FastJSONResponse
+from services.keyset_cursor import KeysetCursor
+from services.metrics import Metrics
+from services.metrics_middleware import MetricsMiddleware
+from services.openai_client import OpenAIClient
+from services.password_hasher import PasswordHasher
+from services.principal_cache import PrincipalCache
+from services.reaction_cache import ReactionCache
+from services.reaction_knowledge_base import ReactionKnowledgeBase
+from services.reaction_service import ReactionService
+from services.rollup_service import RollupService
+from services.row_serializer import RowSerializer
+from services.session_write_buffer import SessionWriteBuffer
+from services.tabular_export import TabularExport
+from services.user_provisioning_service import UserProvisioningService
+from pydantics.analytics_pydantic import AnalyticsPydantic
 from pydantics.auth_pydantic import AuthPydantic
 from pydantics.user_pydantic import UserPydantic
 from pydantics.student_pydantic import StudentPydantic
@@ -23,23 +53,147 @@ from pydantics.grade_pydantic import GradePydantic
 from pydantics.session_pydantic import SessionPydantic
 from pydantics.chat_pydantic import ChatPydantic
 
-database_engine = DatabaseEngine(Configuration.DATABASE_CONNECTION_PARAMETERS)
-app = FastAPI()
+router = APIRouter()
 bearer_scheme = HTTPBearer()
-pwd_context = CryptContext(schemes=[Configuration.CRYPT_SCHEME], deprecated="auto")
-openai.api_key = Configuration.OPENAI_AI_KEY
+
+def create_app(settings=Configuration) -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.metrics = Metrics() if settings.METRICS_ENABLED else None
+    if app.state.metrics is not None:
+        app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+    app.include_router(router)
+    return app
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = app.state.settings
+    database_engine = DatabaseEngine.from_settings(settings)
+    if settings.DATABASE_CREATE_SCHEMA:
+        database_engine.create_schema()
+    else:
+        database_engine.import_models()
+    
+    state = app.state
+    metrics = state.metrics
+    state.database_engine = database_engine
+    password_hash_slots = min(
+        current_default_thread_limiter().total_tokens // 2,
+        settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW,
+    )
+    state.password_hasher = PasswordHasher(
+        settings.CRYPT_SCHEME,
+        rounds=settings.CRYPT_ROUNDS,
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_queue=max(0, min(
+            settings.PASSWORD_HASH_MAX_QUEUE,
+            password_hash_slots - max(settings.PASSWORD_HASH_WORKERS, 1),
+        )),
+    )
+    state.user_provisioning_service = UserProvisioningService(
+        state.password_hasher,
+        batch_rows=settings.USER_BULK_BATCH_ROWS,
+    )
+    state.principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    state.openai_client = OpenAIClient(
+        settings.OPENAI_AI_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout_seconds=settings.OPENAI_TIMEOUT_SECONDS,
+        deadline_seconds=settings.OPENAI_DEADLINE_SECONDS,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        retry_base_delay=settings.OPENAI_RETRY_BASE_DELAY_SECONDS,
+        circuit_breaker=CircuitBreaker(
+            failure_ratio=settings.OPENAI_CIRCUIT_FAILURE_RATIO,
+            window_size=settings.OPENAI_CIRCUIT_WINDOW,
+            minimum_calls=settings.OPENAI_CIRCUIT_MIN_CALLS,
+            open_seconds=settings.OPENAI_CIRCUIT_OPEN_SECONDS,
+            metrics=metrics,
+        ),
+        scheduler=FairScheduler(
+            max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+            max_queue=settings.OPENAI_MAX_QUEUE,
+            burst=settings.OPENAI_STUDENT_BURST,
+            rate_per_second=settings.OPENAI_STUDENT_RATE_PER_MINUTE / 60,
+            metrics=metrics,
+        ),
+        metrics=metrics,
+    )
+    if metrics is not None:
+        metrics.instrument_engine(database_engine.engine, "sync")
+        metrics.instrument_engine(database_engine.async_engine.sync_engine, "async")
+        metrics.openai_in_flight.callback = lambda: state.openai_client.scheduler.in_flight
+        metrics.openai_waiting.callback = lambda: state.openai_client.scheduler.waiting
+        metrics.openai_queued_principals.callback = lambda: state.openai_client.scheduler.queued_principals()
+        metrics.openai_rate_limited.callback = lambda: state.openai_client.scheduler.rate_limited
+        metrics.openai_circuit_state.callback = lambda: CircuitBreaker.STATE_VALUES[state.openai_client.circuit_breaker.state]
+        metrics.openai_circuit_rejections.callback = lambda: state.openai_client.circuit_breaker.rejections
+    state.rollup_service = RollupService()
+    state.data_version_service = DataVersionService()
+    state.grade_serializer = RowSerializer(GradePydantic.GradeResponse)
+    state.session_serializer = RowSerializer(SessionPydantic.SessionResponseExtended)
+    state.tabular_export = TabularExport(database_engine.SessionLocal, batch_rows=settings.EXPORT_BATCH_ROWS)
+    state.session_commit_mode = SessionCommitMode(settings.SESSION_COMMIT_MODE)
+    state.session_write_buffer = SessionWriteBuffer(
+        database_engine.SessionLocal,
+        state.rollup_service,
+        flush_interval_ms=settings.SESSION_FLUSH_INTERVAL_MS,
+        max_batch_rows=settings.SESSION_FLUSH_MAX_ROWS,
+        max_pending=settings.SESSION_BUFFER_MAX_PENDING,
+        data_version_service=state.data_version_service,
+    )
+    if metrics is not None:
+        metrics.session_rows_failed.callback = lambda: state.session_write_buffer.rows_failed
+    reaction_cache = ReactionCache(settings.REACTION_CACHE_MAX_ENTRIES, settings.REACTION_CACHE_TTL_SECONDS)
+    if metrics is not None:
+        metrics.reaction_stale_responses.callback = lambda: reaction_cache.stale_hits
+    state.reaction_service = ReactionService(
+        reaction_cache,
+        ReactionKnowledgeBase(),
+        state.openai_client,
+        database_engine.SessionLocal,
+        model=settings.OPENAI_MODEL,
+        structured_max_attempts=settings.REACTION_STRUCTURED_MAX_ATTEMPTS,
+        batch_concurrency=settings.REACTION_BATCH_CONCURRENCY,
+    )
+    try:
+        yield
+    finally:
+        await state.openai_client.close()
+        state.password_hasher.shutdown()
+        state.session_write_buffer.stop()
+        await database_engine.dispose()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(request: Request):
+    metrics = request.app.state.metrics
+    if metrics is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Metrics are disabled",
+        )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def get_db(request: Request):
+    yield from request.app.state.database_engine.get_db()
+
+async def get_async_db(request: Request):
+    async for db in request.app.state.database_engine.get_async_db():
+        yield db
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: DBSession = Depends(database_engine.get_db),
-) -> User:
+) -> PrincipalCache.Principal:
+    settings = request.app.state.settings
+    principal_cache = request.app.state.principal_cache
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, Configuration.SECRET_KEY, algorithms=[Configuration.ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         user_type: str = payload.get("type")
         if user_id is None or user_type is None:
             raise ValueError
+        user_id = int(user_id)
     except (JWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,134 +201,194 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).get(int(user_id))
-    if not user:
+    principal = principal_cache.get(user_id)
+    if principal is not None and principal.user_type == user_type:
+        return principal
+    
+    model = {
+        UserType.STUDENT: Student,
+        UserType.TEACHER: Teacher,
+    }.get(user_type, User)
+    with request.app.state.database_engine.SessionLocal() as db:
+        user = db.get(model, user_id)
+        principal = PrincipalCache.Principal.from_user(user) if user else None
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    principal_cache.set(principal)
+    return principal
 
 def get_current_student(
-    user: User = Depends(get_current_user),
-    db: DBSession = Depends(database_engine.get_db),
-) -> Student:
-    if user.user_type != User.UserType.STUDENT:
+    user: PrincipalCache.Principal = Depends(get_current_user),
+) -> PrincipalCache.Principal:
+    if user.user_type != UserType.STUDENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only students can access this endpoint",
         )
-    student = db.query(Student).get(user.id)
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student record not found",
-        )
-    return student
+    return user
 
 def get_current_teacher(
-    user: User = Depends(get_current_user),
-    db: DBSession = Depends(database_engine.get_db),
-) -> Teacher:
-    if user.user_type != User.UserType.TEACHER:
+    user: PrincipalCache.Principal = Depends(get_current_user),
+) -> PrincipalCache.Principal:
+    if user.user_type != UserType.TEACHER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only teachers can access this endpoint",
         )
-    teacher = db.query(Teacher).get(user.id)
-    if not teacher:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Teacher record not found",
-        )
-    return teacher
+    return user
+
+def invalidate_principal(app: FastAPI, *user_ids: int) -> None:
+    app.state.principal_cache.invalidate(*user_ids)
+
+def invalidate_teacher_students(app: FastAPI, teacher_id: int) -> None:
+    app.state.principal_cache.invalidate_students_of(teacher_id)
+
+async def conditional_response(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    kind: DataVersionKind,
+    teacher_id: int,
+    filters,
+) -> Response | None:
+    data_version_service = request.app.state.data_version_service
+    version = await data_version_service.version(db, kind, teacher_id)
+    etag = data_version_service.etag(kind, teacher_id, version, filters)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if data_version_service.matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
 
-def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
+def create_access_token(data: dict, settings=Configuration, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=Configuration.ACCESS_TOKEN_EXPIRE_MINUTES))
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, Configuration.SECRET_KEY, algorithm=Configuration.ALGORITHM)
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-@app.post(
+@router.post(
     "/api/v1/users",
     response_model=Union[UserPydantic.UserResponse, StudentPydantic.StudentResponse],
     summary="Create a new user (student or teacher)",
 )
-def create_user(
+async def create_user(
+    request: Request,
     req: Union[UserPydantic.UserCreate, StudentPydantic.StudentCreate],
-    db: DBSession = Depends(database_engine.get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if db.query(UserAuth).filter_by(username=req.username).first():
+    password_hasher = request.app.state.password_hasher
+    if await db.scalar(select(UserAuth.id).filter_by(username=req.username)) is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists",
         )
     
+    if req.user_type == UserType.STUDENT:
+        user = Student(
+            first_name=req.first_name,
+            last_name=req.last_name,
+            assigned_teacher_id=getattr(req, "assigned_teacher_id", None),
+        )
+    elif req.user_type == UserType.TEACHER:
+        user = Teacher(
+            first_name=req.first_name,
+            last_name=req.last_name,
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user type",
+        )
+    
+    await db.close()
+    password_hash = await password_hasher.hash_async(req.password)
     try:
-        if req.user_type == User.UserType.STUDENT:
-            student = Student(
-                first_name=req.first_name,
-                last_name=req.last_name,
-                assigned_teacher_id=getattr(req, "assigned_teacher_id", None),
-            )
-            db.add(student)
-            db.flush()
-            auth = UserAuth(
-                user_id=student.id,
-                username=req.username,
-                password_hash=pwd_context.hash(req.password)
-            )
-            db.add(auth)
-            db.commit()
-            db.refresh(student)
-            return student
-        elif req.user_type == User.UserType.TEACHER:
-            teacher = Teacher(
-                first_name=req.first_name,
-                last_name=req.last_name,
-            )
-            db.add(teacher)
-            db.flush()
-            auth = UserAuth(
-                user_id=teacher.id,
-                username=req.username,
-                password_hash=pwd_context.hash(req.password)
-            )
-            db.add(auth)
-            db.commit()
-            db.refresh(teacher)
-            return teacher
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid user type",
-            )
+        db.add(user)
+        await db.flush()
+        db.add(UserAuth(
+            user_id=user.id,
+            username=req.username,
+            password_hash=password_hash,
+        ))
+        await db.commit()
+        await db.refresh(user)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create user",
         )
+    
+    invalidate_principal(request.app, user.id)
+    return user
 
-@app.post(
+@router.post(
+    "/api/v1/users/bulk",
+    response_model=UserPydantic.UserBulkResponse,
+    summary="Create many users (students or teachers) in batched transactions (teacher only)",
+)
+def create_users_bulk(
+    request: Request,
+    users_data: list[StudentPydantic.StudentCreate],
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: DBSession = Depends(get_db),
+):
+    settings = request.app.state.settings
+    if len(users_data) > settings.USER_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk request can contain at most {settings.USER_BULK_MAX_ITEMS} users",
+        )
+    
+    results = request.app.state.user_provisioning_service.provision(
+        db,
+        [user_data.model_dump() for user_data in users_data],
+    )
+    created_ids = [result["user_id"] for result in results if result["created"]]
+    invalidate_principal(request.app, *created_ids)
+    
+    return {"created": len(created_ids), "failed": len(results) - len(created_ids), "results": results}
+
+@router.post(
     "/api/v1/authenticate",
     response_model=AuthPydantic.AuthResponse,
     summary="Authenticate user and receive a bearer token",
 )
-def login_for_access_token(
+async def login_for_access_token(
+    request: Request,
     req: AuthPydantic.AuthRequest,
-    db: DBSession = Depends(database_engine.get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    auth = db.query(UserAuth).filter_by(username=req.username).first()
-    if not auth or not pwd_context.verify(req.password, auth.password_hash):
+    settings = request.app.state.settings
+    password_hasher = request.app.state.password_hasher
+    auth = (await db.execute(
+        select(UserAuth.id, UserAuth.user_id, UserAuth.password_hash, User.user_type)
+        .outerjoin(User, User.id == UserAuth.user_id)
+        .where(UserAuth.username == req.username)
+    )).first()
+    await db.close()
+    if not auth:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
         )
     
-    user = db.query(User).get(auth.user_id)
-    if not user:
+    verified, updated_hash = await password_hasher.verify_and_update_async(req.password, auth.password_hash)
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+        )
+    
+    if updated_hash:
+        await db.execute(update(UserAuth).where(UserAuth.id == auth.id).values(password_hash=updated_hash))
+        await db.commit()
+    
+    if auth.user_type is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
@@ -182,59 +396,56 @@ def login_for_access_token(
     
     access_token = create_access_token({
         "sub": str(auth.user_id),
-        "type": user.user_type
-    })
+        "type": auth.user_type
+    }, settings)
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user_type": user.user_type,
+        "user_type": auth.user_type,
         "user_id": auth.user_id
     }
 
-@app.get(
+@router.get(
     "/api/v1/grades",
-    response_model=list[GradePydantic.GradeResponse],
+    response_model=GradePydantic.GradePage,
+    response_class=FastJSONResponse,
     summary="Get grades assigned by the current teacher",
 )
-def get_grades(
+async def get_grades(
+    request: Request,
+    response: Response,
     filters: GradePydantic.GradeFilter = Depends(),
-    current_teacher: Teacher = Depends(get_current_teacher),
-    db: DBSession = Depends(database_engine.get_db),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Grade).filter(
-        Grade.grader_teacher_id == current_teacher.id
+    not_modified = await conditional_response(
+        request, response, db, DataVersionKind.GRADES, current_teacher.id, filters,
     )
+    if not_modified is not None:
+        return not_modified
     
-    if filters.student_id:
-        query = query.filter(Grade.graded_student_id == filters.student_id)
-    
-    if filters.start_date:
-        query = query.filter(Grade.date >= filters.start_date)
-    
-    if filters.end_date:
-        query = query.filter(Grade.date <= filters.end_date)
-    
-    if filters.min_score is not None:
-        query = query.filter(Grade.score >= filters.min_score)
-    
-    if filters.max_score is not None:
-        query = query.filter(Grade.score <= filters.max_score)
-    
-    grades = query.order_by(Grade.date.desc()).all()
+    query = grades_query(current_teacher.id, filters)
+    query = KeysetCursor.apply(query, Grade.date, Grade.id, filters.cursor, filters.limit)
+    rows, next_cursor = KeysetCursor.page((await db.execute(query)).all(), filters.limit)
     
-    return grades
+    return FastJSONResponse(
+        {"items": request.app.state.grade_serializer.items(rows), "next_cursor": next_cursor},
+        headers=response.headers,
+    )
 
-@app.post(
+@router.post(
     "/api/v1/grades",
     response_model=GradePydantic.GradeResponse,
     summary="Create a new grade record (teacher only)",
     status_code=status.HTTP_201_CREATED,
 )
 def create_grade(
+    request: Request,
     grade_data: GradePydantic.GradeCreate,
-    current_teacher: Teacher = Depends(get_current_teacher),
-    db: DBSession = Depends(database_engine.get_db),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: DBSession = Depends(get_db),
 ):
+    rollup_service = request.app.state.rollup_service
     student = db.query(Student).get(grade_data.student_id)
     if not student:
         raise HTTPException(
@@ -247,10 +458,12 @@ def create_grade(
             date=grade_data.date,
             graded_student_id=grade_data.student_id,
             grader_teacher_id=current_teacher.id,
-            score=grade_data.score,
+            score=int(grade_data.score),
             comments=grade_data.comments,
         )
         db.add(grade)
+        rollup_service.apply_grades(db, [(grade.graded_student_id, grade.date, grade.score)])
+        request.app.state.data_version_service.bump(db, DataVersionKind.GRADES, [current_teacher.id])
         db.commit()
         db.refresh(grade)
     except IntegrityError:
@@ -260,123 +473,450 @@ def create_grade(
             detail="Failed to create grade record",
         )
     
-    return grade
+    return grade_response(grade.id, grade.date, grade.graded_student_id, grade.grader_teacher_id, grade.score, grade.comments)
 
-@app.get(
+@router.post(
+    "/api/v1/grades/batch",
+    response_model=GradePydantic.GradeBatchResponse,
+    summary="Create many grade records in one transaction (teacher only)",
+)
+def create_grades_batch(
+    request: Request,
+    grades_data: list[GradePydantic.GradeCreate],
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: DBSession = Depends(get_db),
+):
+    settings = request.app.state.settings
+    rollup_service = request.app.state.rollup_service
+    if len(grades_data) > settings.GRADE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch can contain at most {settings.GRADE_BATCH_MAX_ITEMS} grades",
+        )
+    
+    requested_ids = {grade_data.student_id for grade_data in grades_data}
+    existing_ids = {
+        student_id
+        for (student_id,) in db.query(Student.id).filter(Student.id.in_(requested_ids)).all()
+    } if requested_ids else set()
+    
+    accepted = [
+        (index, grade_data)
+        for index, grade_data in enumerate(grades_data)
+        if grade_data.student_id in existing_ids
+    ]
+    rows = [
+        {
+            "date": grade_data.date,
+            "graded_student_id": grade_data.student_id,
+            "grader_teacher_id": current_teacher.id,
+            "score": int(grade_data.score),
+            "comments": grade_data.comments,
+        }
+        for _, grade_data in accepted
+    ]
+    
+    stored = []
+    if rows:
+        try:
+            stored = db.execute(
+                insert(Grade).returning(Grade.id, Grade.date, Grade.score, sort_by_parameter_order=True),
+                rows,
+            ).all()
+            rollup_service.apply_grades(db, (
+                (row["graded_student_id"], stored_grade.date, stored_grade.score)
+                for row, stored_grade in zip(rows, stored)
+            ))
+            request.app.state.data_version_service.bump(db, DataVersionKind.GRADES, [current_teacher.id])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create grade records",
+            )
+    
+    results = [
+        {"index": index, "created": False, "detail": "Student not found"}
+        for index, grade_data in enumerate(grades_data)
+        if grade_data.student_id not in existing_ids
+    ]
+    results.extend(
+        {
+            "index": index,
+            "created": True,
+            "grade": grade_response(
+                stored_grade.id,
+                stored_grade.date,
+                row["graded_student_id"],
+                row["grader_teacher_id"],
+                stored_grade.score,
+                row["comments"],
+            ),
+        }
+        for (index, _), row, stored_grade in zip(accepted, rows, stored)
+    )
+    results.sort(key=lambda result: result["index"])
+    
+    return {"created": len(stored), "failed": len(grades_data) - len(stored), "results": results}
+
+@router.get(
+    "/api/v1/grades/export",
+    response_class=StreamingResponse,
+    summary="Export all grades assigned by the current teacher as CSV or NDJSON",
+)
+def export_grades(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    filters: GradePydantic.GradeFilter = Depends(),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+):
+    query = grades_query(current_teacher.id, filters).order_by(Grade.date, Grade.id)
+    return request.app.state.tabular_export.response(
+        query,
+        ("id", "date", "student_id", "teacher_id", "score", "comments"),
+        export_format,
+        "grades",
+    )
+
+def grades_query(teacher_id: int, filters: GradePydantic.GradeFilter):
+    query = select(
+        Grade.id,
+        Grade.date,
+        Grade.graded_student_id.label("student_id"),
+        Grade.grader_teacher_id.label("teacher_id"),
+        Grade.score,
+        Grade.comments,
+    ).where(
+        Grade.grader_teacher_id == teacher_id
+    )
+    
+    if filters.student_id:
+        query = query.where(Grade.graded_student_id == filters.student_id)
+    
+    if filters.start_date:
+        query = query.where(Grade.date >= filters.start_date)
+    
+    if filters.end_date:
+        query = query.where(Grade.date <= filters.end_date)
+    
+    if filters.min_score is not None:
+        query = query.where(Grade.score >= filters.min_score)
+    
+    if filters.max_score is not None:
+        query = query.where(Grade.score <= filters.max_score)
+    
+    return query
+
+def grade_response(grade_id, date, student_id, teacher_id, score, comments) -> dict:
+    return {
+        "id": grade_id,
+        "date": date,
+        "student_id": student_id,
+        "teacher_id": teacher_id,
+        "score": score,
+        "comments": comments,
+    }
+
+@router.get(
     "/api/v1/sessions",
-    response_model=list[SessionPydantic.SessionResponseExtended],
+    response_model=SessionPydantic.SessionPage,
+    response_class=FastJSONResponse,
     summary="Get study sessions for teacher's students",
 )
-def get_teacher_sessions(
+async def get_teacher_sessions(
+    request: Request,
+    response: Response,
+    filters: SessionPydantic.SessionFilter = Depends(),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: AsyncSession = Depends(get_async_db),
+):
+    not_modified = await conditional_response(
+        request, response, db, DataVersionKind.SESSIONS, current_teacher.id, filters,
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    query = sessions_query(current_teacher.id, filters)
+    query = KeysetCursor.apply(query, StudySession.date, StudySession.id, filters.cursor, filters.limit)
+    rows, next_cursor = KeysetCursor.page(
+        (await db.execute(query)).all(),
+        filters.limit,
+        key=lambda row: (row.date, row.session_id),
+    )
+    
+    return FastJSONResponse(
+        {"items": request.app.state.session_serializer.items(rows), "next_cursor": next_cursor},
+        headers=response.headers,
+    )
+
+@router.get(
+    "/api/v1/sessions/export",
+    response_class=StreamingResponse,
+    summary="Export all study sessions of the teacher's students as CSV or NDJSON",
+)
+def export_sessions(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
     filters: SessionPydantic.SessionFilter = Depends(),
-    current_teacher: Teacher = Depends(get_current_teacher),
-    db: DBSession = Depends(database_engine.get_db),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
 ):
-    query = db.query(StudySession).join(
+    query = sessions_query(current_teacher.id, filters).order_by(StudySession.date, StudySession.id)
+    return request.app.state.tabular_export.response(
+        query,
+        ("session_id", "date", "student_id", "length_minutes", "reactions_total", "student_name"),
+        export_format,
+        "sessions",
+    )
+
+def sessions_query(teacher_id: int, filters: SessionPydantic.SessionFilter):
+    query = select(
+        StudySession.id.label("session_id"),
+        StudySession.date,
+        StudySession.student_id,
+        StudySession.length_minutes,
+        StudySession.reactions_total,
+        (Student.first_name + " " + Student.last_name).label("student_name"),
+    ).join(
         Student,
         StudySession.student_id == Student.id
-    ).filter(
-        Student.assigned_teacher_id == current_teacher.id
+    ).where(
+        Student.assigned_teacher_id == teacher_id
     )
     
     if filters.student_id:
-        query = query.filter(StudySession.student_id == filters.student_id)
+        query = query.where(StudySession.student_id == filters.student_id)
     
     if filters.start_date:
-        query = query.filter(StudySession.date >= filters.start_date)
+        query = query.where(StudySession.date >= filters.start_date)
     
     if filters.end_date:
-        query = query.filter(StudySession.date <= filters.end_date)
+        query = query.where(StudySession.date <= filters.end_date)
     
     if filters.min_duration:
-        query = query.filter(StudySession.length_minutes >= filters.min_duration)
+        query = query.where(StudySession.length_minutes >= filters.min_duration)
     
     if filters.max_duration:
-        query = query.filter(StudySession.length_minutes <= filters.max_duration)
-    
-    sessions = query.order_by(StudySession.date.desc()).all()
-    
-    response = []
-    for session in sessions:
-        student = db.query(Student).get(session.student_id)
-        response.append({
-            "session_id": session.id,
-            "date": session.date,
-            "student_id": session.student_id,
-            "length_minutes": session.length_minutes,
-            "reactions_total": session.reactions_total,
-            "student_name": f"{student.first_name} {student.last_name}"
-        })
+        query = query.where(StudySession.length_minutes <= filters.max_duration)
     
-    return response
+    return query
 
-@app.post(
+@router.post(
     "/api/v1/sessions",
-    response_model=SessionPydantic.SessionResponse,
+    response_model=SessionPydantic.SessionCreateResponse,
     summary="Save a study session for the authenticated student",
 )
 def save_session(
+    request: Request,
     req: SessionPydantic.SessionRequest,
-    current_student: Student = Depends(get_current_student),
-    db: DBSession = Depends(database_engine.get_db),
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
+    db: DBSession = Depends(get_db),
 ):
+    state = request.app.state
     if req.student_id != current_student.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="student_id does not match token subject",
         )
-    session_entry = StudySession(
-        date=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        student_id=current_student.id,
-        length_minutes=req.length_minutes,
-        reactions_total=req.reactions_total
+    session_row = {
+        "date": datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0),
+        "student_id": current_student.id,
+        "length_minutes": req.length_minutes,
+        "reactions_total": req.reactions_total,
+    }
+    
+    if state.session_commit_mode == SessionCommitMode.STRICT:
+        session_entry = StudySession(**session_row)
+        db.add(session_entry)
+        state.rollup_service.apply_sessions(db, [(
+            session_row["student_id"],
+            session_row["date"],
+            session_row["length_minutes"],
+            session_row["reactions_total"],
+        )])
+        state.data_version_service.bump_for_students(db, DataVersionKind.SESSIONS, [current_student.id])
+        db.commit()
+        return {"session_id": session_entry.id}
+    
+    pending = state.session_write_buffer.submit(session_row)
+    if state.session_commit_mode == SessionCommitMode.WRITE_BEHIND:
+        return {"session_id": None}
+    return {"session_id": pending.result()}
+
+@router.get(
+    "/api/v1/analytics/students",
+    response_model=list[AnalyticsPydantic.StudentSummary],
+    summary="Get per-student grade and study totals for the current teacher's students",
+)
+async def get_student_analytics(
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: AsyncSession = Depends(get_async_db),
+):
+    query = select(
+        Student.id,
+        Student.first_name,
+        Student.last_name,
+        StudentRollup.grades_count,
+        StudentRollup.grades_score_total,
+        StudentRollup.sessions_count,
+        StudentRollup.study_minutes_total,
+        StudentRollup.reactions_total,
+    ).outerjoin(
+        StudentRollup,
+        StudentRollup.student_id == Student.id
+    ).where(
+        Student.assigned_teacher_id == current_teacher.id
+    ).order_by(Student.last_name, Student.first_name, Student.id)
+    rows = (await db.execute(query)).all()
+    
+    return [
+        {
+            "student_id": row.id,
+            "student_name": f"{row.first_name} {row.last_name}",
+            "grades_count": row.grades_count or 0,
+            "average_score": row.grades_score_total / row.grades_count if row.grades_count else None,
+            "sessions_count": row.sessions_count or 0,
+            "study_minutes_total": row.study_minutes_total or 0,
+            "reactions_total": row.reactions_total or 0,
+        }
+        for row in rows
+    ]
+
+@router.get(
+    "/api/v1/analytics/students/daily",
+    response_model=list[AnalyticsPydantic.StudentDailySummary],
+    summary="Get per-student daily grade and study totals for the current teacher's students",
+)
+async def get_student_daily_analytics(
+    filters: AnalyticsPydantic.DailyFilter = Depends(),
+    current_teacher: PrincipalCache.Principal = Depends(get_current_teacher),
+    db: AsyncSession = Depends(get_async_db),
+):
+    query = select(StudentDailyRollup).join(
+        Student,
+        StudentDailyRollup.student_id == Student.id
+    ).where(
+        Student.assigned_teacher_id == current_teacher.id
     )
-    db.add(session_entry)
-    db.commit()
-    return {"session_id": session_entry.id}
+    
+    if filters.student_id:
+        query = query.where(StudentDailyRollup.student_id == filters.student_id)
+    
+    if filters.start_day:
+        query = query.where(StudentDailyRollup.day >= filters.start_day)
+    
+    if filters.end_day:
+        query = query.where(StudentDailyRollup.day <= filters.end_day)
+    
+    query = query.order_by(StudentDailyRollup.day.desc(), StudentDailyRollup.student_id)
+    rows = (await db.scalars(query)).all()
+    
+    return [
+        {
+            "student_id": row.student_id,
+            "day": row.day,
+            "grades_count": row.grades_count,
+            "average_score": row.grades_score_total / row.grades_count if row.grades_count else None,
+            "sessions_count": row.sessions_count,
+            "study_minutes_total": row.study_minutes_total,
+            "reactions_total": row.reactions_total,
+        }
+        for row in rows
+    ]
 
-@app.post(
+@router.post(
     "/api/v1/reaction/full",
     response_model=ChatPydantic.ChatResponse,
     summary="Send a prompt to ChatGPT on behalf of the authenticated student",
 )
-def chat(
+async def chat(
+    request: Request,
     req: ChatPydantic.ChatRequest,
-    current_student: Student = Depends(get_current_student),
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
 ):
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": ("Ти вчитель хімії. Коротко опиши одним коротким абзацом ось цю реакцію,"
-        " надай повну формулу й врахуй, що відповідь повинна бути зрозуміла учням і студентам із ООП (надай чіткий, професійний"
-        " і достатньо серйозний проте елегантний опис, із використанням опису багатьох емпіричних властивостей речовини"
-        " на виході реакції: її хімічні та фізичні властивості тощо). Не використовуй у відповіді "
-       f"символів, які можуть погано відображатися (типу markdown, піднесення до степеня тощо):{req.prompt}")}]
-    )
+    return {
+        "response": await request.app.state.reaction_service.respond(ReactionKind.FULL, req.prompt, current_student.id),
+    }
 
-    print(response.choices[0].message.content)
+@router.post(
+    "/api/v1/reaction/full/stream",
+    response_class=StreamingResponse,
+    summary="Stream the ChatGPT reaction description as Server-Sent Events",
+)
+async def chat_stream(
+    request: Request,
+    req: ChatPydantic.ChatRequest,
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
+):
+    chunks = await request.app.state.reaction_service.stream(ReactionKind.FULL, req.prompt, current_student.id)
+    return StreamingResponse(
+        server_sent_events(chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return {"response": response.choices[0].message.content}
+async def server_sent_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        async for delta in chunks:
+            yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+    except Exception as error:
+        detail = error.detail if isinstance(error, HTTPException) else "Failed to generate response"
+        yield f"event: error\ndata: {json.dumps({'detail': detail}, ensure_ascii=False)}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
 
-@app.post(
+@router.post(
     "/api/v1/reaction/empirical",
     response_model=ChatPydantic.ChatResponse,
     summary="Send a prompt to ChatGPT on behalf of the authenticated student",
 )
-def chat(
+async def chat_empirical(
+    request: Request,
     req: ChatPydantic.ChatRequest,
-    current_student: Student = Depends(get_current_student),
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
 ):
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": ("Provide array of RGBa color values in float based on"
-        " the reaction provided (chose realistically) and a single letter: 'p' when reaction creates precipitate; "
-        "'l' when reaction creates liquid; and 'g' when reaction creates gas - only one of those letters,"
-        "state combinations are not allowed. 'a' in RGBa determines transparency - it should not be lower "
-        "than 0.10. Your response should contain ONLY the array value as plain value,"
-        " no additional markdown or anything else, in one line. Always add zeros for floats till value "
-       f"has two numbers after '.' Example: ```[0.75, 0.39, 1.00, 0.45, g]```. The formula:{req.prompt}")}]
-    )
+    return {
+        "response": await request.app.state.reaction_service.respond(ReactionKind.EMPIRICAL, req.prompt, current_student.id),
+    }
 
-    print(response.choices[0].message.content)
+@router.post(
+    "/api/v1/reaction/combined",
+    response_model=ChatPydantic.CombinedReactionResponse,
+    summary="Get the reaction description and its visual properties in a single ChatGPT call",
+)
+async def chat_combined(
+    request: Request,
+    req: ChatPydantic.ChatRequest,
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
+):
+    return await request.app.state.reaction_service.respond_combined(req.prompt, current_student.id)
+
+@router.post(
+    "/api/v1/reaction/batch",
+    response_model=ChatPydantic.ReactionBatchResponse,
+    summary="Get ChatGPT answers for a list of reactions in one request",
+)
+async def chat_batch(
+    request: Request,
+    req: ChatPydantic.ReactionBatchRequest,
+    current_student: PrincipalCache.Principal = Depends(get_current_student),
+):
+    settings = request.app.state.settings
+    if len(req.prompts) > settings.REACTION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch can contain at most {settings.REACTION_BATCH_MAX_ITEMS} reactions",
+        )
+    
+    answers = await request.app.state.reaction_service.respond_many(req.kind, req.prompts, current_student.id)
+    results = []
+    for index, (prompt, (response, detail)) in enumerate(zip(req.prompts, answers)):
+        item = {"index": index, "prompt": prompt, "detail": detail}
+        if response is not None and req.kind == ReactionKind.COMBINED:
+            item["reaction"] = ChatPydantic.CombinedReactionResponse.model_validate_json(response)
+        else:
+            item["response"] = response
+        results.append(item)
+    return {"results": results}
 
-    return {"response": response.choices[0].message.content}
\ No newline at end of file
+app = create_app()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from constants.configuration import Configuration
     
@@ -13,3 +13,8 @@ class Grade(Configuration.BASE):
 
     student = relationship('Student', back_populates='grades')
     grader = relationship('Teacher', back_populates='grades_given')
+
+    __table_args__ = (
+        Index('ix_grades_teacher_date_id', 'grader_teacher_id', 'date', 'id', mssql_include=['score']),
+        Index('ix_grades_teacher_student_date_id', 'grader_teacher_id', 'graded_student_id', 'date', 'id'),
+    )
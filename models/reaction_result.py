@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Unicode, UnicodeText, DateTime, Index
+from constants.configuration import Configuration
+
+class ReactionResult(Configuration.BASE):
+    __tablename__ = 'reaction_results'
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)
+    canonical_formula = Column(Unicode(300), nullable=False)
+    model = Column(String(50), nullable=False)
+    response = Column(UnicodeText, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ux_reaction_results_kind_formula_model', 'kind', 'canonical_formula', 'model', unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .user import User
 from models.study_session import StudySession
@@ -19,3 +19,7 @@ class Student(User):
     )
     sessions = relationship('StudySession', back_populates='student')
     grades = relationship('Grade', back_populates='student')
+
+    __table_args__ = (
+        Index('ix_students_assigned_teacher_id', 'assigned_teacher_id'),
+    )
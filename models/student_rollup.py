@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from constants.configuration import Configuration
+
+class StudentRollup(Configuration.BASE):
+    __tablename__ = 'student_rollups'
+    student_id = Column(Integer, ForeignKey('students.id'), primary_key=True)
+    grades_count = Column(Integer, nullable=False, default=0)
+    grades_score_total = Column(Float, nullable=False, default=0)
+    sessions_count = Column(Integer, nullable=False, default=0)
+    study_minutes_total = Column(Integer, nullable=False, default=0)
+    reactions_total = Column(Integer, nullable=False, default=0)
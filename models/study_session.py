@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from constants.configuration import Configuration
 
@@ -11,3 +11,7 @@ class StudySession(Configuration.BASE):
     reactions_total = Column(Integer, nullable=False)
     
     student = relationship('Student', back_populates='sessions')
+
+    __table_args__ = (
+        Index('ix_sessions_student_date_id', 'student_id', 'date', 'id'),
+    )
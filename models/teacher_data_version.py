@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from constants.configuration import Configuration
+
+class TeacherDataVersion(Configuration.BASE):
+    __tablename__ = 'teacher_data_versions'
+    teacher_id = Column(Integer, ForeignKey('teachers.id'), primary_key=True)
+    grades_version = Column(BigInteger, nullable=False, default=0)
+    sessions_version = Column(BigInteger, nullable=False, default=0)
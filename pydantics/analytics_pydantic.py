@@ -0,0 +1,28 @@
+from datetime import date
+from pydantic import Field
+
+class AnalyticsPydantic:
+    from pydantic import BaseModel
+
+    class StudentSummary(BaseModel):
+        student_id: int = Field(..., example=1)
+        student_name: str = Field(..., example="John Doe")
+        grades_count: int = Field(..., example=12)
+        average_score: float | None = Field(..., example=87.5)
+        sessions_count: int = Field(..., example=30)
+        study_minutes_total: int = Field(..., example=1240)
+        reactions_total: int = Field(..., example=410)
+
+    class StudentDailySummary(BaseModel):
+        student_id: int = Field(..., example=1)
+        day: date = Field(..., example="2025-04-27")
+        grades_count: int
+        average_score: float | None
+        sessions_count: int
+        study_minutes_total: int
+        reactions_total: int
+
+    class DailyFilter(BaseModel):
+        student_id: int | None = Field(None, example=1, description="Filter by specific student")
+        start_day: date | None = Field(None, example="2025-01-01", description="First day to include")
+        end_day: date | None = Field(None, example="2025-12-31", description="Last day to include")
@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Annotated, Literal
+from pydantic import Field, field_validator
+from constants.reaction_kind import ReactionKind
 
 class ChatPydantic:
     from pydantic import BaseModel
@@ -7,4 +9,39 @@ class ChatPydantic:
         prompt: str = Field(..., example="Hello, ChatGPT!")
 
     class ChatResponse(BaseModel):
-        response: str
\ No newline at end of file
+        response: str
+
+    class ReactionVisual(BaseModel):
+        rgba: list[Annotated[float, Field(ge=0, le=1)]] = Field(
+            ...,
+            min_length=4,
+            max_length=4,
+            example=[0.75, 0.39, 1.00, 0.45],
+            description="Color of the reaction result, alpha is at least 0.10",
+        )
+        state: Literal["p", "l", "g"] = Field(..., example="g", description="p - precipitate, l - liquid, g - gas")
+
+        @field_validator("rgba")
+        @classmethod
+        def check_alpha(cls, rgba: list[float]) -> list[float]:
+            if rgba[3] < 0.10:
+                raise ValueError("alpha must not be lower than 0.10")
+            return rgba
+
+    class CombinedReactionResponse(BaseModel):
+        description: str = Field(..., min_length=1)
+        visual: "ChatPydantic.ReactionVisual"
+
+    class ReactionBatchRequest(BaseModel):
+        kind: ReactionKind = Field(ReactionKind.EMPIRICAL, example="empirical")
+        prompts: list[str] = Field(..., min_length=1, example=["H2 + O2", "Na + Cl2"])
+
+    class ReactionBatchItem(BaseModel):
+        index: int = Field(..., example=0, description="Position of the prompt in the request list")
+        prompt: str
+        response: str | None = Field(None, description="Answer for the full and empirical kinds")
+        reaction: "ChatPydantic.CombinedReactionResponse | None" = Field(None, description="Answer for the combined kind")
+        detail: str | None = Field(None, example="Reaction service is busy, try again later")
+
+    class ReactionBatchResponse(BaseModel):
+        results: list["ChatPydantic.ReactionBatchItem"]
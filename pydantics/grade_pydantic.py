@@ -18,9 +18,26 @@ class GradePydantic:
         score: float
         comments: str | None
 
+    class GradeBatchItemResult(BaseModel):
+        index: int = Field(..., example=0, description="Position of the item in the request list")
+        created: bool
+        grade: "GradePydantic.GradeResponse | None" = None
+        detail: str | None = Field(None, example="Student not found")
+
+    class GradeBatchResponse(BaseModel):
+        created: int
+        failed: int
+        results: list["GradePydantic.GradeBatchItemResult"]
+
     class GradeFilter(BaseModel):
         student_id: int | None = Field(None, example=1, description="Filter by specific student")
         start_date: datetime | None = Field(None, example="2025-01-01T00:00:00Z", description="Start date filter")
         end_date: datetime | None = Field(None, example="2025-12-31T23:59:59Z", description="End date filter")
         min_score: float | None = Field(None, example=70.0, ge=0, le=100, description="Minimum score filter")
-        max_score: float | None = Field(None, example=100.0, ge=0, le=100, description="Maximum score filter")
\ No newline at end of file
+        max_score: float | None = Field(None, example=100.0, ge=0, le=100, description="Maximum score filter")
+        limit: int = Field(100, ge=1, le=1000, description="Maximum number of grades per page")
+        cursor: str | None = Field(None, description="Opaque cursor from the previous page's next_cursor")
+
+    class GradePage(BaseModel):
+        items: list["GradePydantic.GradeResponse"]
+        next_cursor: str | None = Field(None, description="Pass as cursor to fetch the next page, null on the last page")
\ No newline at end of file
@@ -12,13 +12,22 @@ class SessionPydantic:
     class SessionResponse(BaseModel):
         session_id: int
 
+    class SessionCreateResponse(BaseModel):
+        session_id: int | None = Field(..., example=1, description="Null when the session is accepted in write-behind mode")
+
     class SessionFilter(BaseModel):
         student_id: int | None = Field(None, example=1, description="Filter by specific student")
         start_date: datetime | None = Field(None, example="2025-01-01T00:00:00Z", description="Start date filter")
         end_date: datetime | None = Field(None, example="2025-12-31T23:59:59Z", description="End date filter")
         min_duration: int | None = Field(None, example=30, ge=1, description="Minimum session duration in minutes")
         max_duration: int | None = Field(None, example=120, ge=1, description="Maximum session duration in minutes")
+        limit: int = Field(100, ge=1, le=1000, description="Maximum number of sessions per page")
+        cursor: str | None = Field(None, description="Opaque cursor from the previous page's next_cursor")
 
     class SessionResponseExtended(SessionResponse):
         student_name: str = Field(..., example="John Doe")
-        student_id: int = Field(..., example=1) 
\ No newline at end of file
+        student_id: int = Field(..., example=1)
+
+    class SessionPage(BaseModel):
+        items: list["SessionPydantic.SessionResponseExtended"]
+        next_cursor: str | None = Field(None, description="Pass as cursor to fetch the next page, null on the last page")
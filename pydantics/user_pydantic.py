@@ -15,4 +15,16 @@ class UserPydantic:
         id: int
         first_name: str
         last_name: str
-        user_type: str
\ No newline at end of file
+        user_type: str
+
+    class UserBulkItemResult(BaseModel):
+        index: int = Field(..., example=0, description="Position of the row in the request list")
+        username: str | None = Field(None, example="alice.smith")
+        created: bool
+        user_id: int | None = None
+        detail: str | None = Field(None, example="Username already exists")
+
+    class UserBulkResponse(BaseModel):
+        created: int
+        failed: int
+        results: list["UserPydantic.UserBulkItemResult"]
@@ -0,0 +1,36 @@
+import argparse
+
+from constants.configuration import Configuration
+from services.database_engine import DatabaseEngine
+
+
+def apply_indexes(engine, dry_run: bool = False) -> list[str]:
+    created = []
+    for table in Configuration.BASE.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if dry_run:
+                created.append(index.name)
+                continue
+            index.create(bind=engine, checkfirst=True)
+            created.append(index.name)
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create missing tables and indexes declared by the models on an existing database"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="only list the declared indexes")
+    args = parser.parse_args()
+
+    database_engine = DatabaseEngine.from_settings(Configuration)
+    if not args.dry_run:
+        database_engine.create_schema()
+    else:
+        database_engine.import_models()
+    for name in apply_indexes(database_engine.engine, dry_run=args.dry_run):
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
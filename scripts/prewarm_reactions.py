@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+
+from constants.configuration import Configuration
+from constants.reaction_kind import ReactionKind
+from services.database_engine import DatabaseEngine
+from services.openai_client import OpenAIClient
+from services.reaction_knowledge_base import ReactionKnowledgeBase
+from services.reaction_cache import ReactionCache
+from services.reaction_service import ReactionService
+
+
+def read_reactions(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as file:
+        lines = (line.strip() for line in file)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-populate the reaction knowledge base from a list of reactions")
+    parser.add_argument("reactions_file", help="text file with one reaction per line")
+    parser.add_argument(
+        "--kind",
+        action="append",
+        choices=[kind.value for kind in ReactionKind],
+        help="reaction endpoint(s) to pre-warm, defaults to all of them",
+    )
+    parser.add_argument("--force", action="store_true", help="regenerate reactions that are already stored")
+    asyncio.run(prewarm(parser.parse_args()))
+
+
+async def prewarm(args):
+    database_engine = DatabaseEngine.from_settings(Configuration)
+    database_engine.import_models()
+    openai_client = OpenAIClient(Configuration.OPENAI_AI_KEY, base_url=Configuration.OPENAI_BASE_URL)
+    knowledge_base = ReactionKnowledgeBase()
+    reaction_service = ReactionService(ReactionCache(0, 0), knowledge_base, openai_client, database_engine.SessionLocal)
+    kinds = [ReactionKind(kind) for kind in args.kind] if args.kind else list(ReactionKind)
+
+    seen = set()
+    stored = skipped = failed = 0
+    db = database_engine.SessionLocal()
+    try:
+        for reaction in read_reactions(args.reactions_file):
+            canonical = knowledge_base.canonicalize(reaction)
+            for kind in kinds:
+                if (kind, canonical) in seen:
+                    continue
+                seen.add((kind, canonical))
+                if not args.force and knowledge_base.lookup(db, kind, reaction, reaction_service.model) is not None:
+                    skipped += 1
+                    continue
+                try:
+                    response = await reaction_service.complete(kind, reaction)
+                except Exception as error:
+                    failed += 1
+                    print(f"[{kind.value}] {reaction}: {error}")
+                    continue
+                if args.force:
+                    knowledge_base.delete(db, kind, reaction, reaction_service.model)
+                knowledge_base.store(db, kind, reaction, reaction_service.model, response)
+                stored += 1
+    finally:
+        db.close()
+        await openai_client.close()
+
+    print(f"stored={stored} skipped={skipped} failed={failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import csv
+import json
+import os
+import time
+
+from pydantic import ValidationError
+
+from constants.configuration import Configuration
+from pydantics.student_pydantic import StudentPydantic
+from services.database_engine import DatabaseEngine
+from services.password_hasher import PasswordHasher
+from services.user_provisioning_service import UserProvisioningService
+
+
+def read_rows(path: str) -> list[dict]:
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        if path.lower().endswith(".json"):
+            return json.load(file)
+        return [
+            {key: value for key, value in row.items() if value not in (None, "")}
+            for row in csv.DictReader(file)
+        ]
+
+
+def parse_rows(rows: list[dict]) -> tuple[list[tuple[int, dict]], list[dict]]:
+    parsed = []
+    failed = []
+    for index, row in enumerate(rows):
+        try:
+            parsed.append((index, StudentPydantic.StudentCreate.model_validate(row).model_dump()))
+        except ValidationError as error:
+            failed.append({
+                "index": index,
+                "username": row.get("username"),
+                "created": False,
+                "user_id": None,
+                "detail": "; ".join(
+                    f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+                    for item in error.errors(include_url=False)
+                ),
+            })
+    return parsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create student and teacher accounts from a CSV or JSON file")
+    parser.add_argument(
+        "users_file",
+        help="CSV with a header row or JSON list; fields: first_name, last_name, username, password, user_type, "
+        "assigned_teacher_id",
+    )
+    parser.add_argument("--batch-size", type=int, default=Configuration.USER_BULK_BATCH_ROWS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="password hashing processes")
+    parser.add_argument("--report", help="write per-row results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = read_rows(args.users_file)
+    parsed, results = parse_rows(rows)
+
+    database_engine = DatabaseEngine.from_settings(Configuration)
+    database_engine.import_models()
+    password_hasher = PasswordHasher(Configuration.CRYPT_SCHEME, rounds=Configuration.CRYPT_ROUNDS, max_workers=args.workers)
+    service = UserProvisioningService(password_hasher, batch_rows=args.batch_size)
+    db = database_engine.SessionLocal()
+    started = time.perf_counter()
+    try:
+        for result in service.provision(db, [row for _, row in parsed]):
+            result["index"] = parsed[result["index"]][0]
+            results.append(result)
+    finally:
+        db.close()
+        password_hasher.shutdown()
+    elapsed = time.perf_counter() - started
+    results.sort(key=lambda result: result["index"])
+
+    for result in results:
+        if not result["created"]:
+            print(f"row {result['index'] + 1} ({result['username']}): {result['detail']}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+    created = sum(result["created"] for result in results)
+    print(f"created={created} failed={len(results) - created} seconds={elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
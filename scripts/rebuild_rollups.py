@@ -0,0 +1,76 @@
+import argparse
+
+from sqlalchemy import delete, select
+
+from constants.configuration import Configuration
+from services.database_engine import DatabaseEngine
+from services.rollup_service import RollupService
+
+
+def rebuild_rollups(db, rollup_service: RollupService, batch_size: int = 10000) -> dict:
+    from models.grade import Grade
+    from models.study_session import StudySession
+    from models.student_rollup import StudentRollup
+    from models.student_daily_rollup import StudentDailyRollup
+
+    db.execute(delete(StudentDailyRollup))
+    db.execute(delete(StudentRollup))
+
+    totals, daily = rollup_service.empty_deltas()
+    grades_count = rollup_service.accumulate_grades(totals, daily, db.execute(
+        select(Grade.graded_student_id, Grade.date, Grade.score)
+        .where(Grade.graded_student_id.is_not(None))
+        .execution_options(yield_per=batch_size)
+    ))
+    sessions_count = rollup_service.accumulate_sessions(totals, daily, db.execute(
+        select(StudySession.student_id, StudySession.date, StudySession.length_minutes, StudySession.reactions_total)
+        .where(StudySession.student_id.is_not(None))
+        .execution_options(yield_per=batch_size)
+    ))
+
+    insert_in_batches(db, StudentRollup.__table__, [
+        {"student_id": student_id, **delta}
+        for student_id, delta in totals.items()
+    ], batch_size)
+    insert_in_batches(db, StudentDailyRollup.__table__, [
+        {"student_id": student_id, "day": day, **delta}
+        for (student_id, day), delta in daily.items()
+    ], batch_size)
+
+    return {
+        "grades": grades_count,
+        "sessions": sessions_count,
+        "student_rollups": len(totals),
+        "student_daily_rollups": len(daily),
+    }
+
+
+def insert_in_batches(db, table, rows: list[dict], batch_size: int) -> None:
+    for start in range(0, len(rows), batch_size):
+        db.execute(table.insert(), rows[start:start + batch_size])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute student rollups from all grades and sessions (run while writes are paused)"
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    database_engine = DatabaseEngine.from_settings(Configuration)
+    database_engine.import_models()
+    db = database_engine.SessionLocal()
+    try:
+        counts = rebuild_rollups(db, RollupService(), batch_size=args.batch_size)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(" ".join(f"{name}={count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
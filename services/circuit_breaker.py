@@ -0,0 +1,76 @@
+import math
+import time
+from collections import deque
+
+from constants.circuit_state import CircuitState
+
+
+class CircuitBreaker:
+    STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_seconds: float = 30.0,
+        metrics=None,
+    ):
+        self.failure_ratio = failure_ratio
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.metrics = metrics
+        self.state = CircuitState.CLOSED
+        self.rejections = 0
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def rejecting(self) -> bool:
+        if self.state == CircuitState.OPEN:
+            return time.monotonic() - self._opened_at < self.open_seconds
+        return self.state == CircuitState.HALF_OPEN and self._probing
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN and not self.rejecting():
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejections += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+        elif self.state == CircuitState.CLOSED:
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+        elif self.state == CircuitState.CLOSED:
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.minimum_calls and failures / len(self._outcomes) >= self.failure_ratio:
+                self._transition(CircuitState.OPEN)
+
+    def record_cancelled(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._probing = False
+
+    def retry_after(self) -> int:
+        if self.state != CircuitState.OPEN:
+            return 1
+        return max(1, math.ceil(self.open_seconds - (time.monotonic() - self._opened_at)))
+
+    def _transition(self, state: CircuitState) -> None:
+        self.state = state
+        self._probing = False
+        self._outcomes.clear()
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if self.metrics is not None:
+            self.metrics.openai_circuit_transitions.inc(state.value)
@@ -0,0 +1,68 @@
+import hashlib
+import json
+from typing import Iterable
+
+from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as DBSession
+
+from constants.data_version_kind import DataVersionKind
+from models.student import Student
+from models.teacher_data_version import TeacherDataVersion
+
+
+class DataVersionService:
+    @staticmethod
+    def column(kind: DataVersionKind):
+        return TeacherDataVersion.__table__.c[f"{kind.value}_version"]
+
+    def bump(self, db: DBSession, kind: DataVersionKind, teacher_ids: Iterable[int | None]) -> None:
+        table = TeacherDataVersion.__table__
+        column = self.column(kind)
+        for teacher_id in sorted({teacher_id for teacher_id in teacher_ids if teacher_id is not None}):
+            statement = update(table).where(table.c.teacher_id == teacher_id).values({column: column + 1})
+            if db.execute(statement).rowcount:
+                continue
+            try:
+                with db.begin_nested():
+                    db.execute(insert(table).values({
+                        "teacher_id": teacher_id,
+                        "grades_version": 0,
+                        "sessions_version": 0,
+                        column.name: 1,
+                    }))
+            except IntegrityError:
+                db.execute(statement)
+
+    def bump_for_students(self, db: DBSession, kind: DataVersionKind, student_ids: Iterable[int]) -> None:
+        student_ids = set(student_ids)
+        if not student_ids:
+            return
+        teacher_ids = db.scalars(
+            select(Student.assigned_teacher_id).where(Student.id.in_(student_ids)).distinct()
+        ).all()
+        self.bump(db, kind, teacher_ids)
+
+    async def version(self, db: AsyncSession, kind: DataVersionKind, teacher_id: int) -> int:
+        version = await db.scalar(
+            select(self.column(kind)).where(TeacherDataVersion.teacher_id == teacher_id)
+        )
+        return version or 0
+
+    @staticmethod
+    def etag(kind: DataVersionKind, teacher_id: int, version: int, filters: BaseModel) -> str:
+        parameters = json.dumps(filters.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha1(parameters.encode()).hexdigest()[:16]
+        return f'"{kind.value}-{teacher_id}-{version}-{digest}"'
+
+    @staticmethod
+    def matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == etag:
+                return True
+        return False
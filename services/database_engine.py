@@ -1,21 +1,115 @@
 class DatabaseEngine:
-    def __init__(self, database_connection_parameters: str):
+    ASYNC_DRIVERS = {
+        "sqlite": "sqlite+aiosqlite",
+        "mssql": "mssql+aioodbc",
+        "postgresql": "postgresql+asyncpg",
+        "mysql": "mysql+aiomysql",
+    }
+
+    def __init__(
+        self,
+        database_url: str,
+        async_database_url: str | None = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+    ):
         from sqlalchemy import create_engine
+        from sqlalchemy.engine import make_url
         from sqlalchemy.orm import sessionmaker
-        from sqlalchemy.ext.declarative import declarative_base
         from constants.configuration import Configuration
-        import urllib.parse
 
-        self.engine = create_engine(
-            f"mssql+pyodbc:///?odbc_connect={urllib.parse.quote_plus(database_connection_parameters)}"
-        )
+        self.url = make_url(database_url)
+        self.async_url = make_url(async_database_url) if async_database_url else self.to_async_url(self.url)
+        self.pool_settings = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+        }
+
+        self.engine = create_engine(self.url, **self.pool_options(self.url, **self.pool_settings))
 
         self.base = Configuration.BASE
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self._async_engine = None
+        self._async_session_factory = None
 
-        from models import user, user_auth, student, teacher, grade, study_session
+    @staticmethod
+    def import_models() -> None:
+        from models import user, user_auth, student, teacher, grade, study_session, reaction_result
+        from models import student_rollup, student_daily_rollup, teacher_data_version
 
+    def create_schema(self) -> None:
+        self.import_models()
         self.base.metadata.create_all(bind=self.engine)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+
+    @classmethod
+    def from_settings(cls, settings) -> "DatabaseEngine":
+        return cls(
+            cls.database_url(settings),
+            async_database_url=settings.DATABASE_ASYNC_URL,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        )
+
+    @staticmethod
+    def database_url(settings) -> str:
+        import urllib.parse
+
+        if settings.DATABASE_URL:
+            return settings.DATABASE_URL
+        return f"mssql+pyodbc:///?odbc_connect={urllib.parse.quote_plus(settings.DATABASE_CONNECTION_PARAMETERS)}"
+
+    @staticmethod
+    def to_async_url(url):
+        backend = url.get_backend_name()
+        if backend not in DatabaseEngine.ASYNC_DRIVERS:
+            raise ValueError(f"No async driver known for '{backend}', set DATABASE_ASYNC_URL")
+        return url.set(drivername=DatabaseEngine.ASYNC_DRIVERS[backend])
+
+    @staticmethod
+    def pool_options(url, **options) -> dict:
+        if url.get_backend_name() != "sqlite":
+            return options
+
+        from sqlalchemy.pool import StaticPool
+
+        sqlite_options = dict(options)
+        if url.database in (None, "", ":memory:"):
+            sqlite_options = {
+                "poolclass": StaticPool,
+                "pool_recycle": options["pool_recycle"],
+                "pool_pre_ping": options["pool_pre_ping"],
+            }
+        if url.get_driver_name() in ("pysqlite", "aiosqlite"):
+            sqlite_options["connect_args"] = {"check_same_thread": False}
+        return sqlite_options
+
+    @property
+    def async_engine(self):
+        if self._async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            self._async_engine = create_async_engine(
+                self.async_url,
+                **self.pool_options(self.async_url, **self.pool_settings),
+            )
+        return self._async_engine
+
+    @property
+    def AsyncSessionLocal(self):
+        if self._async_session_factory is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self._async_session_factory = async_sessionmaker(bind=self.async_engine, expire_on_commit=False)
+        return self._async_session_factory
 
     def get_db(self):
         db = self.SessionLocal()
@@ -23,3 +117,12 @@ class DatabaseEngine:
             yield db
         finally:
             db.close()
+
+    async def get_async_db(self):
+        async with self.AsyncSessionLocal() as db:
+            yield db
+
+    async def dispose(self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        self.engine.dispose()
@@ -0,0 +1,143 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+
+
+class FairScheduler:
+    class Ticket:
+        def __init__(self, principal_id):
+            self.principal_ids = [principal_id]
+            self.future: asyncio.Future | None = None
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        max_queue: int = 64,
+        burst: int = 10,
+        rate_per_second: float = 0.0,
+        metrics=None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.burst = burst
+        self.rate_per_second = rate_per_second
+        self.metrics = metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.rate_limited = 0
+        self._buckets: dict = {}
+        self._pruned_at = time.monotonic()
+        self._queues: OrderedDict = OrderedDict()
+
+    def ensure_capacity(self) -> None:
+        if self.in_flight >= self.max_concurrency and self.waiting >= self.max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Reaction service is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+    def check(self, principal_id) -> None:
+        if principal_id is None or self.rate_per_second <= 0:
+            return
+        self._tokens(principal_id, time.monotonic())
+
+    def admit(self, principal_id) -> None:
+        if principal_id is None or self.rate_per_second <= 0:
+            return
+        now = time.monotonic()
+        self._buckets[principal_id] = (self._tokens(principal_id, now) - 1, now)
+        self._prune(now)
+
+    def refund(self, principal_id) -> None:
+        bucket = self._buckets.get(principal_id)
+        if bucket is not None:
+            self._buckets[principal_id] = (min(self.burst, bucket[0] + 1), bucket[1])
+
+    def share(self, ticket: "FairScheduler.Ticket", principal_id) -> None:
+        if principal_id is None or principal_id in ticket.principal_ids:
+            return
+        ticket.principal_ids.append(principal_id)
+        if ticket.future is not None and not ticket.future.done():
+            self._enqueue(principal_id, ticket.future)
+
+    def _tokens(self, principal_id, now: float) -> float:
+        tokens, updated_at = self._buckets.get(principal_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate_per_second)
+        if tokens < 1:
+            self.rate_limited += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many reaction requests, try again later",
+                headers={"Retry-After": str(math.ceil((1 - tokens) / self.rate_per_second))},
+            )
+        return tokens
+
+    @asynccontextmanager
+    async def slot(self, principal_id, ticket: "FairScheduler.Ticket | None" = None):
+        await self.acquire(principal_id, ticket)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, principal_id, ticket: "FairScheduler.Ticket | None" = None) -> None:
+        started = time.perf_counter()
+        if self.in_flight < self.max_concurrency and not self.waiting:
+            self.in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            for queued_principal_id in ticket.principal_ids if ticket is not None else (principal_id,):
+                self._enqueue(queued_principal_id, future)
+            if ticket is not None:
+                ticket.future = future
+            self.waiting += 1
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()
+                raise
+            finally:
+                self.waiting -= 1
+                if ticket is not None:
+                    ticket.future = None
+        if self.metrics is not None:
+            self.metrics.openai_queue_wait.observe(time.perf_counter() - started)
+
+    def release(self) -> None:
+        while self._queues:
+            principal_id, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(principal_id)
+            else:
+                del self._queues[principal_id]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _enqueue(self, principal_id, future: asyncio.Future) -> None:
+        queue = self._queues.get(principal_id)
+        if queue is None:
+            queue = self._queues[principal_id] = deque()
+        queue.append(future)
+
+    def queued_principals(self) -> int:
+        return len(self._queues)
+
+    def _prune(self, now: float) -> None:
+        refill_seconds = self.burst / self.rate_per_second
+        if now - self._pruned_at < refill_seconds:
+            return
+        self._pruned_at = now
+        self._buckets = {
+            principal_id: bucket
+            for principal_id, bucket in self._buckets.items()
+            if now - bucket[1] < refill_seconds
+        }
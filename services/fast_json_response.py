@@ -0,0 +1,22 @@
+import json
+from datetime import date, datetime, time
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=self.default).encode("utf-8")
+
+    @staticmethod
+    def default(value):
+        if isinstance(value, (date, datetime, time)):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
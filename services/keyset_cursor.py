@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_
+
+
+class KeysetCursor:
+    @staticmethod
+    def encode(date: datetime, row_id: int) -> str:
+        payload = json.dumps([date.isoformat(), row_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> tuple[datetime, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            date, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(date), int(row_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    @staticmethod
+    def apply(statement: Select, date_column, id_column, cursor: str | None, limit: int) -> Select:
+        if cursor:
+            date, row_id = KeysetCursor.decode(cursor)
+            statement = statement.where(or_(
+                date_column < date,
+                and_(date_column == date, id_column < row_id),
+            ))
+        return statement.order_by(date_column.desc(), id_column.desc()).limit(limit + 1)
+
+    @staticmethod
+    def page(
+        rows: list,
+        limit: int,
+        key: Callable = lambda row: (row.date, row.id),
+    ) -> tuple[list, str | None]:
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, KeysetCursor.encode(*key(rows[-1]))
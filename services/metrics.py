@@ -0,0 +1,243 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class Metrics:
+    class RequestStats:
+        __slots__ = ("statements", "sql_seconds")
+
+        def __init__(self):
+            self.statements = 0
+            self.sql_seconds = 0.0
+
+    class Counter:
+        kind = "counter"
+
+        def __init__(self, name: str, description: str, label_names: tuple = (), callback: Callable[[], float] | None = None):
+            self.name = name
+            self.description = description
+            self.label_names = label_names
+            self.callback = callback
+            self._values: dict[tuple, float] = {}
+            self._lock = threading.Lock()
+
+        def inc(self, *labels, amount: float = 1) -> None:
+            with self._lock:
+                self._values[labels] = self._values.get(labels, 0) + amount
+
+        def samples(self):
+            if self.callback is not None:
+                yield self.name, {}, self.callback()
+                return
+            with self._lock:
+                values = list(self._values.items())
+            for labels, value in values:
+                yield self.name, dict(zip(self.label_names, labels)), value
+
+    class Gauge(Counter):
+        kind = "gauge"
+
+        def dec(self, *labels, amount: float = 1) -> None:
+            self.inc(*labels, amount=-amount)
+
+    class Histogram:
+        kind = "histogram"
+
+        def __init__(self, name: str, description: str, label_names: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+            self.name = name
+            self.description = description
+            self.label_names = label_names
+            self.buckets = buckets
+            self._values: dict[tuple, list] = {}
+            self._lock = threading.Lock()
+
+        def observe(self, value: float, *labels) -> None:
+            index = bisect.bisect_left(self.buckets, value)
+            with self._lock:
+                series = self._values.get(labels)
+                if series is None:
+                    series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                series[0][index] += 1
+                series[1] += value
+
+        def samples(self):
+            with self._lock:
+                values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+            for labels, counts, total in values:
+                label_values = dict(zip(self.label_names, labels))
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    yield f"{self.name}_bucket", {**label_values, "le": Metrics.format_value(bound)}, cumulative
+                yield f"{self.name}_sum", label_values, total
+                yield f"{self.name}_count", label_values, cumulative
+
+    _request_stats: contextvars.ContextVar = contextvars.ContextVar("request_stats", default=None)
+
+    def __init__(self):
+        self._metrics = []
+        self.requests_in_flight = self.gauge("http_requests_in_flight", "HTTP requests currently being served")
+        self.request_duration = self.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+        )
+        self.request_statements = self.histogram(
+            "http_request_sql_statements", "SQL statements executed per HTTP request", ("method", "route"), COUNT_BUCKETS,
+        )
+        self.request_sql_duration = self.histogram(
+            "http_request_sql_duration_seconds", "Time spent in SQL per HTTP request", ("method", "route"),
+        )
+        self.sql_statements = self.counter("sql_statements_total", "SQL statements executed", ("engine",))
+        self.sql_duration = self.histogram("sql_statement_duration_seconds", "SQL statement latency", ("engine",))
+        self.pool_checkout_wait = self.histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",),
+        )
+        self.pool_checked_out = self.gauge("db_pool_checked_out", "Connections checked out of the pool", ("engine",))
+        self.openai_duration = self.histogram(
+            "openai_request_duration_seconds", "OpenAI call latency", ("operation", "outcome"),
+        )
+        self.openai_tokens = self.counter("openai_tokens_total", "OpenAI token usage", ("type",))
+        self.openai_errors = self.counter("openai_errors_total", "Failed OpenAI calls", ("error",))
+        self.openai_retries = self.counter("openai_retries_total", "Retried OpenAI calls", ("operation",))
+        self.openai_circuit_state = self.gauge(
+            "openai_circuit_state", "OpenAI circuit breaker state (0 closed, 1 half-open, 2 open)", callback=lambda: 0,
+        )
+        self.openai_circuit_transitions = self.counter(
+            "openai_circuit_transitions_total", "OpenAI circuit breaker state changes", ("state",),
+        )
+        self.openai_circuit_rejections = self.counter(
+            "openai_circuit_rejections_total", "OpenAI calls rejected by the open circuit", callback=lambda: 0,
+        )
+        self.reaction_stale_responses = self.counter(
+            "reaction_stale_responses_total", "Expired cached answers served because OpenAI failed", callback=lambda: 0,
+        )
+        self.session_rows_failed = self.counter(
+            "session_rows_failed_total", "Study sessions the write buffer failed to save", callback=lambda: 0,
+        )
+        self.openai_queue_wait = self.histogram("openai_queue_wait_seconds", "Time OpenAI calls wait for a slot")
+        self.openai_queued_principals = self.gauge(
+            "openai_queued_principals", "Students with OpenAI calls waiting for a slot", callback=lambda: 0,
+        )
+        self.openai_rate_limited = self.counter(
+            "openai_rate_limited_total", "OpenAI calls rejected by the per-student quota", callback=lambda: 0,
+        )
+        self.openai_in_flight = self.gauge("openai_requests_in_flight", "OpenAI calls currently running", callback=lambda: 0)
+        self.openai_waiting = self.gauge("openai_requests_waiting", "OpenAI calls waiting for a slot", callback=lambda: 0)
+        self.threadpool_busy = self.gauge(
+            "threadpool_busy_threads", "Worker threads running sync endpoints and dependencies",
+            callback=lambda: self.thread_limiter().borrowed_tokens,
+        )
+        self.threadpool_waiting = self.gauge(
+            "threadpool_waiting_tasks", "Calls waiting for a free worker thread",
+            callback=lambda: self.thread_limiter().statistics().tasks_waiting,
+        )
+
+    def counter(self, name: str, description: str, label_names: tuple = (), callback=None) -> "Metrics.Counter":
+        return self._register(self.Counter(name, description, label_names, callback))
+
+    def gauge(self, name: str, description: str, label_names: tuple = (), callback=None) -> "Metrics.Gauge":
+        return self._register(self.Gauge(name, description, label_names, callback))
+
+    def histogram(self, name: str, description: str, label_names: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> "Metrics.Histogram":
+        return self._register(self.Histogram(name, description, label_names, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    @staticmethod
+    def thread_limiter():
+        from anyio.to_thread import current_default_thread_limiter
+
+        return current_default_thread_limiter()
+
+    def start_request(self) -> tuple["Metrics.RequestStats", contextvars.Token]:
+        stats = self.RequestStats()
+        return stats, self._request_stats.set(stats)
+
+    def finish_request(self, stats: "Metrics.RequestStats", token: contextvars.Token, method: str, route: str, status_code: int, seconds: float) -> None:
+        self._request_stats.reset(token)
+        self.request_duration.observe(seconds, method, route, str(status_code))
+        self.request_statements.observe(stats.statements, method, route)
+        self.request_sql_duration.observe(stats.sql_seconds, method, route)
+
+    def instrument_engine(self, engine, name: str) -> None:
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            seconds = time.perf_counter() - conn.info["query_started"].pop()
+            self.sql_statements.inc(name)
+            self.sql_duration.observe(seconds, name)
+            stats = self._request_stats.get()
+            if stats is not None:
+                stats.statements += 1
+                stats.sql_seconds += seconds
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if context.connection is not None:
+                started = context.connection.info.get("query_started")
+                if started:
+                    started.pop()
+
+        @event.listens_for(engine, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self.pool_checked_out.inc(name)
+
+        @event.listens_for(engine, "checkin")
+        def checkin(dbapi_connection, connection_record):
+            self.pool_checked_out.dec(name)
+
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection():
+            started = time.perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                self.pool_checkout_wait.observe(time.perf_counter() - started, name)
+
+        engine.raw_connection = timed_raw_connection
+
+    def observe_openai(self, operation: str, seconds: float, usage=None, error: BaseException | None = None) -> None:
+        self.openai_duration.observe(seconds, operation, "error" if error is not None else "success")
+        if error is not None:
+            self.openai_errors.inc(type(error).__name__)
+        if usage is not None:
+            self.openai_tokens.inc("prompt", amount=usage.prompt_tokens or 0)
+            self.openai_tokens.inc("completion", amount=usage.completion_tokens or 0)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{self.escape(str(label))}"' for key, label in labels.items())
+                    lines.append(f"{name}{{{rendered}}} {self.format_value(value)}")
+                else:
+                    lines.append(f"{name} {self.format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    @staticmethod
+    def format_value(value: float) -> str:
+        if value == float("inf"):
+            return "+Inf"
+        if float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
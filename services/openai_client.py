@@ -0,0 +1,210 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, status
+
+from services.circuit_breaker import CircuitBreaker
+from services.fair_scheduler import FairScheduler
+
+
+class OpenAIClient:
+    def __init__(
+        self,
+        api_key: str | None,
+        base_url: str | None = None,
+        max_concurrency: int = 16,
+        max_queue: int = 64,
+        timeout_seconds: float = 20.0,
+        deadline_seconds: float = 45.0,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.25,
+        circuit_breaker: CircuitBreaker | None = None,
+        scheduler: FairScheduler | None = None,
+        metrics=None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._client = None
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(metrics=metrics)
+        self.scheduler = scheduler or FairScheduler(max_concurrency, max_queue, metrics=metrics)
+        self.retries = 0
+        self.metrics = metrics
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout_seconds,
+                max_retries=0,
+            )
+        return self._client
+
+    async def complete(
+        self,
+        model: str,
+        messages: list[dict],
+        response_format: dict | None = None,
+        principal_id: int | None = None,
+        admitted: bool = False,
+        ticket: FairScheduler.Ticket | None = None,
+    ) -> str:
+        options = {"response_format": response_format} if response_format else {}
+        async with self.slot(principal_id, admitted, ticket):
+            response, started = await self.call(
+                "complete",
+                lambda: self.client.chat.completions.create(model=model, messages=messages, **options),
+            )
+        self.observe("complete", started, usage=response.usage)
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        model: str,
+        messages: list[dict],
+        principal_id: int | None = None,
+        admitted: bool = False,
+    ) -> AsyncIterator[str]:
+        async with self.slot(principal_id, admitted):
+            response, started = await self.call(
+                "stream",
+                lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+            )
+            usage = None
+            try:
+                async for chunk in response:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except Exception as error:
+                self.observe("stream", started, error=error)
+                self.record(error)
+                raise self.upstream_error(error) from error
+            self.observe("stream", started, usage=usage)
+
+    async def call(self, operation: str, request: Callable[[], Awaitable]) -> tuple:
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                raise self.circuit_open_error()
+            started = time.perf_counter()
+            try:
+                timeout = min(self.timeout_seconds, deadline - time.monotonic())
+                response = await asyncio.wait_for(request(), max(timeout, 0))
+                self.circuit_breaker.record_success()
+                return response, started
+            except asyncio.CancelledError:
+                self.circuit_breaker.record_cancelled()
+                raise
+            except Exception as error:
+                self.observe(operation, started, error=error)
+                retryable = self.record(error)
+                delay = random.uniform(0, self.retry_base_delay * 2 ** attempt)
+                if (
+                    not retryable
+                    or attempt >= self.max_retries
+                    or time.monotonic() + delay >= deadline
+                    or self.circuit_breaker.rejecting()
+                ):
+                    raise self.upstream_error(error) from error
+            attempt += 1
+            self.retries += 1
+            if self.metrics is not None:
+                self.metrics.openai_retries.inc(operation)
+            await asyncio.sleep(delay)
+
+    def record(self, error: Exception) -> bool:
+        retryable = self.retryable(error)
+        if retryable:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return retryable
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        from openai import APIConnectionError, APIStatusError
+
+        if isinstance(error, (TimeoutError, APIConnectionError)):
+            return True
+        return isinstance(error, APIStatusError) and (error.status_code in (408, 409, 429) or error.status_code >= 500)
+
+    @staticmethod
+    def upstream_error(error: Exception) -> HTTPException:
+        from openai import APITimeoutError
+
+        if isinstance(error, (TimeoutError, APITimeoutError)):
+            return HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Reaction service did not answer in time",
+            )
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Reaction service is unavailable",
+        )
+
+    def circuit_open_error(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Reaction service is temporarily unavailable, try again later",
+            headers={"Retry-After": str(self.circuit_breaker.retry_after())},
+        )
+
+    def observe(self, operation: str, started: float, usage=None, error: BaseException | None = None) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_openai(operation, time.perf_counter() - started, usage=usage, error=error)
+
+    def check_quota(self, principal_id: int | None) -> None:
+        self.scheduler.check(principal_id)
+
+    def admit(self, principal_id: int | None) -> None:
+        self.scheduler.admit(principal_id)
+
+    def refund(self, principal_id: int | None) -> None:
+        self.scheduler.refund(principal_id)
+
+    def ensure_available(self) -> None:
+        if self.circuit_breaker.rejecting():
+            self.circuit_breaker.rejections += 1
+            raise self.circuit_open_error()
+        self.scheduler.ensure_capacity()
+
+    def ensure_capacity(self, principal_id: int | None = None) -> None:
+        self.ensure_available()
+        self.scheduler.admit(principal_id)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        principal_id: int | None = None,
+        admitted: bool = False,
+        ticket: FairScheduler.Ticket | None = None,
+    ):
+        if admitted:
+            self.ensure_available()
+        else:
+            self.ensure_capacity(principal_id)
+        async with self.scheduler.slot(principal_id, ticket):
+            yield
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
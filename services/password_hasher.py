@@ -0,0 +1,107 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+_crypt_contexts: dict = {}
+
+
+def _crypt_context(scheme: str, rounds: int | None) -> CryptContext:
+    context = _crypt_contexts.get((scheme, rounds))
+    if context is None:
+        settings = {}
+        if rounds:
+            settings = {f"{scheme}__default_rounds": rounds, f"{scheme}__min_rounds": rounds}
+        context = CryptContext(schemes=[scheme], deprecated="auto", **settings)
+        _crypt_contexts[(scheme, rounds)] = context
+    return context
+
+
+def _hash(scheme: str, rounds: int | None, password: str) -> str:
+    return _crypt_context(scheme, rounds).hash(password)
+
+
+def _verify_and_update(scheme: str, rounds: int | None, password: str, password_hash: str) -> tuple[bool, str | None]:
+    return _crypt_context(scheme, rounds).verify_and_update(password, password_hash)
+
+
+class PasswordHasher:
+    def __init__(self, scheme: str, rounds: int | None = None, max_workers: int = 0, max_queue: int = 0):
+        self.scheme = scheme
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + max_queue)
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        if self.max_workers <= 0:
+            return [self.hash(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.max_workers * 4))
+        with self._slot():
+            return list(self._get_executor().map(
+                _hash,
+                repeat(self.scheme),
+                repeat(self.rounds),
+                passwords,
+                chunksize=chunksize,
+            ))
+
+    def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        return self._run(_verify_and_update, password, password_hash)
+
+    async def verify_and_update_async(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        return await self._run_async(_verify_and_update, password, password_hash)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _run(self, function, *args):
+        with self._slot():
+            if self.max_workers <= 0:
+                return function(self.scheme, self.rounds, *args)
+            return self._get_executor().submit(function, self.scheme, self.rounds, *args).result()
+
+    async def _run_async(self, function, *args):
+        with self._slot():
+            if self.max_workers <= 0:
+                return await run_in_threadpool(function, self.scheme, self.rounds, *args)
+            return await asyncio.wrap_future(self._get_executor().submit(function, self.scheme, self.rounds, *args))
+
+    @contextmanager
+    def _slot(self):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class PrincipalCache:
+    class Principal(NamedTuple):
+        id: int
+        user_type: str
+        first_name: str
+        last_name: str
+        assigned_teacher_id: int | None = None
+
+        @classmethod
+        def from_user(cls, user) -> "PrincipalCache.Principal":
+            return cls(
+                id=user.id,
+                user_type=getattr(user.user_type, "value", user.user_type),
+                first_name=user.first_name,
+                last_name=user.last_name,
+                assigned_teacher_id=getattr(user, "assigned_teacher_id", None),
+            )
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> "PrincipalCache.Principal | None":
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, principal: "PrincipalCache.Principal") -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def invalidate_students_of(self, teacher_id: int) -> None:
+        with self._lock:
+            for user_id in [
+                user_id
+                for user_id, (_, principal) in self._entries.items()
+                if principal.assigned_teacher_id == teacher_id
+            ]:
+                del self._entries[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+
+class ReactionCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def make_key(endpoint: str, prompt: str, model: str) -> tuple:
+        return (str(endpoint), " ".join(prompt.split()), model)
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            return self._get_locked(key)
+
+    def get_stale(self, key: tuple) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, value: str) -> None:
+        with self._lock:
+            self._set_locked(key, value)
+
+    def in_flight(self, key: tuple) -> asyncio.Task | None:
+        with self._lock:
+            return self._in_flight.get(key)
+
+    def join(self, key: tuple) -> asyncio.Task | None:
+        with self._lock:
+            task = self._in_flight.get(key)
+            if task is not None:
+                self.coalesced += 1
+            return task
+
+    async def get_or_compute(self, key: tuple, compute: Callable[[], Awaitable[str]]) -> str:
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                return value
+            task = self._in_flight.get(key)
+            if task is None:
+                self.misses += 1
+                task = asyncio.ensure_future(compute())
+                self._in_flight[key] = task
+                task.add_done_callback(lambda done: self._complete(key, done))
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_hits": self.stale_hits,
+            }
+
+    def _complete(self, key: tuple, task: asyncio.Task) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if not task.cancelled() and task.exception() is None:
+                self._set_locked(key, task.result())
+
+    def _get_locked(self, key: tuple) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _set_locked(self, key: tuple, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
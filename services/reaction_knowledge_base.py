@@ -0,0 +1,111 @@
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as DBSession
+
+from constants.reaction_kind import ReactionKind
+from models.reaction_result import ReactionResult
+
+
+class ReactionKnowledgeBase:
+    ARROW = re.compile(r"->|=>|→|⟶|=")
+    SPACED_PLUS = re.compile(r"\s+\+\s+")
+    COEFFICIENT = re.compile(r"^\d+(?:[.,]\d+)?")
+    MAX_FORMULA_LENGTH = ReactionResult.canonical_formula.type.length
+
+    @staticmethod
+    def canonicalize(formula: str) -> str:
+        reactants = ReactionKnowledgeBase.ARROW.split(formula, maxsplit=1)[0]
+        if ReactionKnowledgeBase.SPACED_PLUS.search(reactants):
+            parts = ReactionKnowledgeBase.SPACED_PLUS.split(reactants)
+        else:
+            parts = reactants.split("+")
+        species = set()
+        for part in parts:
+            compact = "".join(part.split())
+            compact = ReactionKnowledgeBase.COEFFICIENT.sub("", compact)
+            if compact:
+                species.add(compact)
+        return "+".join(sorted(species))
+
+    @staticmethod
+    def storable(canonical_formula: str) -> bool:
+        return len(canonical_formula) <= ReactionKnowledgeBase.MAX_FORMULA_LENGTH
+
+    def lookup(self, db: DBSession, kind: ReactionKind, formula: str, model: str) -> str | None:
+        canonical_formula = self.canonicalize(formula)
+        if not self.storable(canonical_formula):
+            return None
+        return db.query(ReactionResult.response).filter(
+            ReactionResult.kind == kind.value,
+            ReactionResult.canonical_formula == canonical_formula,
+            ReactionResult.model == model,
+        ).scalar()
+
+    def lookup_many(self, db: DBSession, kind: ReactionKind, formulas: list[str], model: str) -> dict[str, str]:
+        canonical_formulas = {
+            canonical_formula
+            for canonical_formula in map(self.canonicalize, formulas)
+            if self.storable(canonical_formula)
+        }
+        if not canonical_formulas:
+            return {}
+        return dict(db.query(ReactionResult.canonical_formula, ReactionResult.response).filter(
+            ReactionResult.kind == kind.value,
+            ReactionResult.canonical_formula.in_(canonical_formulas),
+            ReactionResult.model == model,
+        ).all())
+
+    def store(self, db: DBSession, kind: ReactionKind, formula: str, model: str, response: str) -> None:
+        canonical_formula = self.canonicalize(formula)
+        if not self.storable(canonical_formula):
+            return
+        try:
+            db.add(ReactionResult(
+                kind=kind.value,
+                canonical_formula=canonical_formula,
+                model=model,
+                response=response,
+                created_at=datetime.now(timezone.utc),
+            ))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+
+    def store_many(self, db: DBSession, kind: ReactionKind, responses: dict[str, str], model: str) -> None:
+        canonical_responses = {self.canonicalize(formula): response for formula, response in responses.items()}
+        canonical_responses = {
+            canonical_formula: response
+            for canonical_formula, response in canonical_responses.items()
+            if self.storable(canonical_formula)
+        }
+        if not canonical_responses:
+            return
+        existing = self.lookup_many(db, kind, list(canonical_responses), model)
+        created_at = datetime.now(timezone.utc)
+        try:
+            db.add_all(
+                ReactionResult(
+                    kind=kind.value,
+                    canonical_formula=canonical_formula,
+                    model=model,
+                    response=response,
+                    created_at=created_at,
+                )
+                for canonical_formula, response in canonical_responses.items()
+                if canonical_formula not in existing
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            for canonical_formula, response in canonical_responses.items():
+                self.store(db, kind, canonical_formula, model, response)
+
+    def delete(self, db: DBSession, kind: ReactionKind, formula: str, model: str) -> None:
+        db.query(ReactionResult).filter(
+            ReactionResult.kind == kind.value,
+            ReactionResult.canonical_formula == self.canonicalize(formula),
+            ReactionResult.model == model,
+        ).delete(synchronize_session=False)
+        db.commit()
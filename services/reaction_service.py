@@ -0,0 +1,313 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session as DBSession
+from starlette.concurrency import run_in_threadpool
+
+from constants.configuration import Configuration
+from constants.reaction_kind import ReactionKind
+from constants.reaction_prompt import ReactionPrompt
+from pydantics.chat_pydantic import ChatPydantic
+from services.fair_scheduler import FairScheduler
+from services.openai_client import OpenAIClient
+from services.reaction_cache import ReactionCache
+from services.reaction_knowledge_base import ReactionKnowledgeBase
+
+
+class ReactionService:
+    UPSTREAM_ERRORS = {
+        status.HTTP_502_BAD_GATEWAY,
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        status.HTTP_504_GATEWAY_TIMEOUT,
+    }
+
+    def __init__(
+        self,
+        cache: ReactionCache,
+        knowledge_base: ReactionKnowledgeBase,
+        openai_client: OpenAIClient,
+        session_factory: Callable[[], DBSession],
+        model: str = Configuration.OPENAI_MODEL,
+        structured_max_attempts: int = Configuration.REACTION_STRUCTURED_MAX_ATTEMPTS,
+        batch_concurrency: int = Configuration.REACTION_BATCH_CONCURRENCY,
+    ):
+        self.cache = cache
+        self.knowledge_base = knowledge_base
+        self.openai_client = openai_client
+        self.session_factory = session_factory
+        self.model = model
+        self.structured_max_attempts = structured_max_attempts
+        self.structured_retries = 0
+        self.batch_concurrency = batch_concurrency
+        self._tickets: dict[tuple, FairScheduler.Ticket] = {}
+
+    async def respond(self, kind: ReactionKind, prompt: str, principal_id: int | None = None) -> str:
+        key = self.cache.make_key(kind.value, self.knowledge_base.canonicalize(prompt), self.model)
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        try:
+            return await self.get_or_compute(
+                key,
+                principal_id,
+                lambda ticket: self._lookup_or_complete(kind, prompt, principal_id, ticket),
+            )
+        except HTTPException as error:
+            response = self.stale(key, error)
+            if response is None:
+                raise
+            return response
+
+    async def respond_combined(self, prompt: str, principal_id: int | None = None) -> ChatPydantic.CombinedReactionResponse:
+        response = await self.respond(ReactionKind.COMBINED, prompt, principal_id)
+        return ChatPydantic.CombinedReactionResponse.model_validate_json(response)
+
+    async def respond_many(
+        self,
+        kind: ReactionKind,
+        prompts: list[str],
+        principal_id: int | None = None,
+    ) -> list[tuple[str | None, str | None]]:
+        canonical = [self.knowledge_base.canonicalize(prompt) for prompt in prompts]
+        unique = {}
+        for formula, prompt in zip(canonical, prompts):
+            unique.setdefault(formula, prompt)
+        keys = {formula: self.cache.make_key(kind.value, formula, self.model) for formula in unique}
+        results = {}
+        
+        missing = []
+        for formula, key in keys.items():
+            response = self.cache.get(key)
+            if response is not None:
+                results[formula] = (response, None)
+            elif self.cache.in_flight(key) is None:
+                missing.append(formula)
+        if missing:
+            stored = await run_in_threadpool(self._lookup_many, kind, [unique[formula] for formula in missing])
+            for formula, response in stored.items():
+                self.cache.set(keys[formula], response)
+                results[formula] = (response, None)
+        
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        computed = {}
+
+        async def resolve(formula: str) -> None:
+            async with semaphore:
+                try:
+                    response = await self.get_or_compute(
+                        keys[formula],
+                        principal_id,
+                        lambda ticket: self.complete(kind, unique[formula], principal_id, ticket, admitted=True),
+                    )
+                except HTTPException as error:
+                    response = self.stale(keys[formula], error)
+                    results[formula] = (response, None) if response is not None else (None, error.detail)
+                except Exception:
+                    results[formula] = (None, "Failed to generate response")
+                else:
+                    results[formula] = (response, None)
+                    computed[formula] = response
+
+        await asyncio.gather(*(resolve(formula) for formula in keys if formula not in results))
+        if computed:
+            await run_in_threadpool(self._store_many, kind, computed)
+        return [results[formula] for formula in canonical]
+
+    async def stream(self, kind: ReactionKind, prompt: str, principal_id: int | None = None) -> AsyncIterator[str]:
+        key = self.cache.make_key(kind.value, self.knowledge_base.canonicalize(prompt), self.model)
+        response = self.cache.get(key)
+        if response is None:
+            response = await self.join(key, principal_id)
+        if response is None:
+            self.openai_client.check_quota(principal_id)
+            response = await run_in_threadpool(self._lookup, kind, prompt)
+            if response is not None:
+                self.cache.set(key, response)
+        if response is not None:
+            return self._replay(response)
+        try:
+            self.openai_client.ensure_capacity(principal_id)
+        except HTTPException as error:
+            response = self.stale(key, error)
+            if response is None:
+                raise
+            return self._replay(response)
+        return self._stream_and_store(key, kind, prompt, principal_id)
+
+    async def get_or_compute(
+        self,
+        key: tuple,
+        principal_id: int | None,
+        compute: Callable[[FairScheduler.Ticket], Awaitable[str]],
+    ) -> str:
+        while True:
+            response = await self.join(key, principal_id)
+            if response is not None:
+                return response
+            if self.cache.in_flight(key) is not None:
+                continue
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+            self.openai_client.admit(principal_id)
+            ticket = self._tickets[key] = FairScheduler.Ticket(principal_id)
+            return await self.cache.get_or_compute(key, lambda: self._compute_shared(key, ticket, compute))
+
+    async def join(self, key: tuple, principal_id: int | None) -> str | None:
+        task = self.cache.join(key)
+        if task is None:
+            return None
+        ticket = self._tickets.get(key)
+        if ticket is not None:
+            self.openai_client.scheduler.share(ticket, principal_id)
+        try:
+            return await asyncio.shield(task)
+        except HTTPException as error:
+            if error.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+                raise
+            return None
+
+    def stale(self, key: tuple, error: HTTPException) -> str | None:
+        if error.status_code not in self.UPSTREAM_ERRORS:
+            return None
+        return self.cache.get_stale(key)
+
+    async def complete(
+        self,
+        kind: ReactionKind,
+        prompt: str,
+        principal_id: int | None = None,
+        ticket: FairScheduler.Ticket | None = None,
+        admitted: bool = False,
+    ) -> str:
+        if kind == ReactionKind.COMBINED:
+            return await self.complete_structured(prompt, principal_id, ticket, admitted)
+        content = await self.openai_client.complete(
+            self.model,
+            [{"role": "user", "content": ReactionPrompt.build(kind, prompt)}],
+            principal_id=principal_id,
+            admitted=admitted,
+            ticket=ticket,
+        )
+        return content
+
+    async def complete_structured(
+        self,
+        prompt: str,
+        principal_id: int | None = None,
+        ticket: FairScheduler.Ticket | None = None,
+        admitted: bool = False,
+    ) -> str:
+        messages = [{"role": "user", "content": ReactionPrompt.build(ReactionKind.COMBINED, prompt)}]
+        for attempt in range(self.structured_max_attempts):
+            content = await self.openai_client.complete(
+                self.model,
+                messages,
+                response_format={"type": "json_object"},
+                principal_id=principal_id,
+                admitted=admitted or attempt > 0,
+                ticket=ticket,
+            )
+            try:
+                return ChatPydantic.CombinedReactionResponse.model_validate_json(content).model_dump_json()
+            except ValidationError as error:
+                self.structured_retries += 1
+                messages = messages[:1] + [
+                    {"role": "assistant", "content": content},
+                    {
+                        "role": "user",
+                        "content": "The answer does not match the required JSON shape: "
+                        f"{error.errors(include_url=False, include_input=False)}. Answer again with only the JSON object.",
+                    },
+                ]
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Reaction service returned malformed output",
+        )
+
+    async def _compute_shared(
+        self,
+        key: tuple,
+        ticket: FairScheduler.Ticket,
+        compute: Callable[[FairScheduler.Ticket], Awaitable[str]],
+    ) -> str:
+        try:
+            return await compute(ticket)
+        finally:
+            if self._tickets.get(key) is ticket:
+                del self._tickets[key]
+
+    async def _lookup_or_complete(
+        self,
+        kind: ReactionKind,
+        prompt: str,
+        principal_id: int | None,
+        ticket: FairScheduler.Ticket,
+    ) -> str:
+        stored = await run_in_threadpool(self._lookup, kind, prompt)
+        if stored is not None:
+            self.openai_client.refund(principal_id)
+            return stored
+        response = await self.complete(kind, prompt, principal_id, ticket, admitted=True)
+        await run_in_threadpool(self._store, kind, prompt, response)
+        return response
+
+    async def _replay(self, response: str) -> AsyncIterator[str]:
+        yield response
+
+    async def _stream_and_store(
+        self,
+        key: tuple,
+        kind: ReactionKind,
+        prompt: str,
+        principal_id: int | None,
+    ) -> AsyncIterator[str]:
+        parts = []
+        try:
+            async for delta in self.openai_client.stream(
+                self.model,
+                [{"role": "user", "content": ReactionPrompt.build(kind, prompt)}],
+                principal_id=principal_id,
+                admitted=True,
+            ):
+                parts.append(delta)
+                yield delta
+        except HTTPException as error:
+            response = None if parts else self.stale(key, error)
+            if response is None:
+                raise
+            yield response
+            return
+        response = "".join(parts)
+        self.cache.set(key, response)
+        await run_in_threadpool(self._store, kind, prompt, response)
+
+    def _lookup(self, kind: ReactionKind, prompt: str) -> str | None:
+        db = self.session_factory()
+        try:
+            return self.knowledge_base.lookup(db, kind, prompt, self.model)
+        finally:
+            db.close()
+
+    def _lookup_many(self, kind: ReactionKind, prompts: list[str]) -> dict[str, str]:
+        db = self.session_factory()
+        try:
+            return self.knowledge_base.lookup_many(db, kind, prompts, self.model)
+        finally:
+            db.close()
+
+    def _store_many(self, kind: ReactionKind, responses: dict[str, str]) -> None:
+        db = self.session_factory()
+        try:
+            self.knowledge_base.store_many(db, kind, responses, self.model)
+        finally:
+            db.close()
+
+    def _store(self, kind: ReactionKind, prompt: str, response: str) -> None:
+        db = self.session_factory()
+        try:
+            self.knowledge_base.store(db, kind, prompt, self.model, response)
+        finally:
+            db.close()
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as DBSession
+
+from models.student_daily_rollup import StudentDailyRollup
+from models.student_rollup import StudentRollup
+
+
+class RollupService:
+    COUNTERS = ("grades_count", "grades_score_total", "sessions_count", "study_minutes_total", "reactions_total")
+
+    def apply_grades(self, db: DBSession, grades: Iterable[tuple[int, datetime, float]]) -> None:
+        totals, daily = self.empty_deltas()
+        self.accumulate_grades(totals, daily, grades)
+        self._apply(db, totals, daily)
+
+    def apply_sessions(self, db: DBSession, sessions: Iterable[tuple[int, datetime, int, int]]) -> None:
+        totals, daily = self.empty_deltas()
+        self.accumulate_sessions(totals, daily, sessions)
+        self._apply(db, totals, daily)
+
+    def empty_deltas(self) -> tuple[defaultdict, defaultdict]:
+        def zeros():
+            return dict.fromkeys(self.COUNTERS, 0)
+        return defaultdict(zeros), defaultdict(zeros)
+
+    def accumulate_grades(self, totals: dict, daily: dict, grades: Iterable[tuple[int, datetime, float]]) -> int:
+        count = 0
+        for student_id, graded_at, score in grades:
+            count += 1
+            for delta in (totals[student_id], daily[(student_id, self.day_of(graded_at))]):
+                delta["grades_count"] += 1
+                delta["grades_score_total"] += score
+        return count
+
+    def accumulate_sessions(self, totals: dict, daily: dict, sessions: Iterable[tuple[int, datetime, int, int]]) -> int:
+        count = 0
+        for student_id, studied_at, length_minutes, reactions_total in sessions:
+            count += 1
+            for delta in (totals[student_id], daily[(student_id, self.day_of(studied_at))]):
+                delta["sessions_count"] += 1
+                delta["study_minutes_total"] += length_minutes
+                delta["reactions_total"] += reactions_total
+        return count
+
+    @staticmethod
+    def day_of(value: datetime | date | str) -> date:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+    def _apply(self, db: DBSession, totals: dict, daily: dict) -> None:
+        for student_id, delta in sorted(totals.items()):
+            self._increment(db, StudentRollup.__table__, {"student_id": student_id}, delta)
+        for (student_id, day), delta in sorted(daily.items()):
+            self._increment(db, StudentDailyRollup.__table__, {"student_id": student_id, "day": day}, delta)
+
+    def _increment(self, db: DBSession, table, key: dict, delta: dict) -> None:
+        delta = {column: value for column, value in delta.items() if value}
+        if not delta:
+            return
+        statement = update(table).where(
+            *(table.c[column] == value for column, value in key.items())
+        ).values({column: table.c[column] + value for column, value in delta.items()})
+        if db.execute(statement).rowcount:
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(table).values({**dict.fromkeys(self.COUNTERS, 0), **key, **delta}))
+        except IntegrityError:
+            db.execute(statement)
@@ -0,0 +1,16 @@
+from operator import attrgetter
+from typing import Iterable
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class RowSerializer:
+    def __init__(self, model: type[BaseModel]):
+        fields = model.model_fields
+        self.columns = tuple(fields)
+        self.values = attrgetter(*self.columns)
+        self.adapter = TypeAdapter(list[tuple[tuple(field.annotation for field in fields.values())]])
+
+    def items(self, rows: Iterable) -> list[dict]:
+        validated = self.adapter.validate_python([self.values(row) for row in rows])
+        return [dict(zip(self.columns, values)) for values in validated]
@@ -0,0 +1,148 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session as DBSession
+
+from constants.data_version_kind import DataVersionKind
+from models.study_session import StudySession
+from services.data_version_service import DataVersionService
+from services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+
+class SessionWriteBuffer:
+    def __init__(
+        self,
+        session_factory: Callable[[], DBSession],
+        rollup_service: RollupService,
+        flush_interval_ms: int = 50,
+        max_batch_rows: int = 200,
+        max_pending: int = 10000,
+        data_version_service: DataVersionService | None = None,
+    ):
+        self.session_factory = session_factory
+        self.rollup_service = rollup_service
+        self.data_version_service = data_version_service
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self.batches_flushed = 0
+        self.rows_flushed = 0
+        self.rows_failed = 0
+
+    def submit(self, row: dict) -> Future:
+        future = Future()
+        with self._lock:
+            if self._stopped:
+                self._flush([(row, future)])
+                return future
+            self._ensure_started()
+            try:
+                self._queue.put_nowait((row, future))
+            except queue.Full:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many pending study sessions, try again later",
+                    headers={"Retry-After": "1"},
+                )
+        return future
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-write-buffer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._drain()
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stopping:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.max_batch_rows:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple[dict, Future]]) -> None:
+        db = self.session_factory()
+        try:
+            session_ids = db.scalars(
+                insert(StudySession).returning(StudySession.id, sort_by_parameter_order=True),
+                [row for row, _ in batch],
+            ).all()
+            self.rollup_service.apply_sessions(db, (
+                (row["student_id"], row["date"], row["length_minutes"], row["reactions_total"])
+                for row, _ in batch
+            ))
+            if self.data_version_service is not None:
+                self.data_version_service.bump_for_students(
+                    db,
+                    DataVersionKind.SESSIONS,
+                    (row["student_id"] for row, _ in batch),
+                )
+            db.commit()
+        except Exception as error:
+            db.rollback()
+            if len(batch) == 1:
+                row, future = batch[0]
+                self.rows_failed += 1
+                logger.error("Failed to save study session %s", row, exc_info=error)
+                future.set_exception(error)
+                return
+            for item in batch:
+                self._flush([item])
+            return
+        finally:
+            db.close()
+        self.batches_flushed += 1
+        self.rows_flushed += len(batch)
+        for (_, future), session_id in zip(batch, session_ids):
+            future.set_result(session_id)
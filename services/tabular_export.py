@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session as DBSession
+
+from constants.export_format import ExportFormat
+
+
+class TabularExport:
+    MEDIA_TYPES = {
+        ExportFormat.CSV: "text/csv; charset=utf-8",
+        ExportFormat.NDJSON: "application/x-ndjson",
+    }
+
+    def __init__(self, session_factory: Callable[[], DBSession], batch_rows: int = 1000):
+        self.session_factory = session_factory
+        self.batch_rows = batch_rows
+
+    def response(
+        self,
+        statement: Select,
+        columns: tuple[str, ...],
+        export_format: ExportFormat,
+        filename: str,
+        convert: Callable[[tuple], tuple] | None = None,
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            self.stream(statement, columns, export_format, convert),
+            media_type=self.MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+        )
+
+    def stream(
+        self,
+        statement: Select,
+        columns: tuple[str, ...],
+        export_format: ExportFormat,
+        convert: Callable[[tuple], tuple] | None = None,
+    ) -> Iterator[str]:
+        db = self.session_factory()
+        try:
+            result = db.execute(statement.execution_options(yield_per=self.batch_rows))
+            if export_format == ExportFormat.CSV:
+                yield self.csv_chunk([columns])
+            for rows in result.partitions():
+                rows = [tuple(map(self.plain, convert(row) if convert else row)) for row in rows]
+                if export_format == ExportFormat.CSV:
+                    yield self.csv_chunk(rows)
+                else:
+                    yield self.ndjson_chunk(columns, rows)
+        finally:
+            db.close()
+
+    @staticmethod
+    def plain(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def csv_chunk(rows: Iterable[tuple]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def ndjson_chunk(columns: tuple[str, ...], rows: Iterable[tuple]) -> str:
+        return "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in rows
+        )
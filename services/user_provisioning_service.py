@@ -0,0 +1,115 @@
+from typing import Iterable
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as DBSession
+
+from constants.user_type import UserType
+from models.student import Student
+from models.teacher import Teacher
+from models.user_auth import UserAuth
+from services.password_hasher import PasswordHasher
+
+
+class UserProvisioningService:
+    LOOKUP_CHUNK = 1000
+
+    def __init__(self, password_hasher: PasswordHasher, batch_rows: int = 500):
+        self.password_hasher = password_hasher
+        self.batch_rows = batch_rows
+
+    def provision(self, db: DBSession, rows: list[dict]) -> list[dict]:
+        results = [
+            {"index": index, "username": row.get("username"), "created": False, "user_id": None, "detail": None}
+            for index, row in enumerate(rows)
+        ]
+
+        accepted = self.validate(db, rows, results)
+        db.close()
+        password_hashes = self.password_hasher.hash_many([rows[index]["password"] for index in accepted])
+        pending = list(zip(accepted, password_hashes))
+        for start in range(0, len(pending), self.batch_rows):
+            self.insert_batch(db, rows, results, pending[start:start + self.batch_rows])
+        return results
+
+    def validate(self, db: DBSession, rows: list[dict], results: list[dict]) -> list[int]:
+        existing_usernames = self.existing(db, UserAuth.username, (row.get("username") for row in rows))
+        existing_teachers = self.existing(db, Teacher.id, (row.get("assigned_teacher_id") for row in rows))
+
+        accepted = []
+        seen = set()
+        for index, row in enumerate(rows):
+            username = row.get("username")
+            user_type = row.get("user_type")
+            if not username or not row.get("password") or not row.get("first_name") or not row.get("last_name"):
+                detail = "first_name, last_name, username and password are required"
+            elif user_type not in (UserType.STUDENT, UserType.TEACHER):
+                detail = "Invalid user type"
+            elif username in existing_usernames:
+                detail = "Username already exists"
+            elif username in seen:
+                detail = "Duplicate username in request"
+            elif (
+                user_type == UserType.STUDENT
+                and row.get("assigned_teacher_id") is not None
+                and row["assigned_teacher_id"] not in existing_teachers
+            ):
+                detail = "Teacher not found"
+            else:
+                detail = None
+
+            if username:
+                seen.add(username)
+            if detail is None:
+                accepted.append(index)
+            else:
+                results[index]["detail"] = detail
+        return accepted
+
+    def existing(self, db: DBSession, column, values: Iterable) -> set:
+        values = list({value for value in values if value is not None})
+        found = set()
+        for start in range(0, len(values), self.LOOKUP_CHUNK):
+            found.update(db.scalars(select(column).where(column.in_(values[start:start + self.LOOKUP_CHUNK]))).all())
+        return found
+
+    def insert_batch(self, db: DBSession, rows: list[dict], results: list[dict], batch: list[tuple[int, str]]) -> None:
+        try:
+            for model in (Student, Teacher):
+                items = [
+                    (index, password_hash)
+                    for index, password_hash in batch
+                    if rows[index]["user_type"] == model.__mapper__.polymorphic_identity
+                ]
+                if not items:
+                    continue
+                user_ids = db.scalars(
+                    insert(model).returning(model.id, sort_by_parameter_order=True),
+                    [self.user_values(model, rows[index]) for index, _ in items],
+                ).all()
+                db.execute(insert(UserAuth), [
+                    {"user_id": user_id, "username": rows[index]["username"], "password_hash": password_hash}
+                    for (index, password_hash), user_id in zip(items, user_ids)
+                ])
+                for (index, _), user_id in zip(items, user_ids):
+                    results[index]["user_id"] = user_id
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            for index, _ in batch:
+                results[index]["user_id"] = None
+            if len(batch) == 1:
+                results[batch[0][0]]["detail"] = "Failed to create user"
+                return
+            for item in batch:
+                self.insert_batch(db, rows, results, [item])
+            return
+        for index, _ in batch:
+            results[index]["created"] = True
+
+    @staticmethod
+    def user_values(model, row: dict) -> dict:
+        values = {"first_name": row["first_name"], "last_name": row["last_name"]}
+        if model is Student:
+            values["assigned_teacher_id"] = row.get("assigned_teacher_id")
+        return values
@@ -0,0 +1,17 @@
+import pytest
+
+from constants.configuration import Configuration
+
+
+@pytest.fixture
+def settings(tmp_path):
+    def build(name: str = "test", **overrides):
+        return type("TestSettings", (Configuration,), {
+            "SECRET_KEY": "test-secret",
+            "DATABASE_URL": f"sqlite:///{tmp_path}/{name}.db",
+            "DATABASE_ASYNC_URL": None,
+            "DATABASE_CREATE_SCHEMA": False,
+            "PASSWORD_HASH_WORKERS": 0,
+            **overrides,
+        })
+    return build
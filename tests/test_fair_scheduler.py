@@ -0,0 +1,27 @@
+import asyncio
+
+from services.fair_scheduler import FairScheduler
+
+
+async def grant_order() -> list[str]:
+    scheduler = FairScheduler(max_concurrency=1, max_queue=10)
+    order = []
+
+    async def run(name: str, principal_id, ticket=None):
+        async with scheduler.slot(principal_id, ticket):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire("hog")
+    ticket = FairScheduler.Ticket("hog")
+    tasks = [asyncio.create_task(run(f"hog-{index}", "hog")) for index in range(3)]
+    tasks.append(asyncio.create_task(run("shared", "hog", ticket)))
+    await asyncio.sleep(0)
+    scheduler.share(ticket, "student")
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_shared_ticket_is_served_in_the_joining_principal_turn():
+    assert asyncio.run(grant_order()) == ["hog-0", "shared", "hog-1", "hog-2"]
@@ -0,0 +1,33 @@
+import asyncio
+
+import httpx
+
+from benchmarks.endpoint_benchmark import login
+from benchmarks.sqlite_dataset import seed
+from main import create_app
+from services.database_engine import DatabaseEngine
+
+
+async def create_grades(settings) -> tuple[dict, dict]:
+    database_engine = DatabaseEngine(settings.DATABASE_URL)
+    database_engine.create_schema()
+    dataset = seed(database_engine.engine, teachers=1, students_per_teacher=1, grades_per_student=1, sessions_per_student=1)
+    database_engine.engine.dispose()
+
+    app = create_app(settings)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = await login(client, dataset["teacher_ids"][0])
+            grade = {"student_id": dataset["student_ids"][0], "date": "2025-04-27T12:34:56Z", "score": 95.5}
+            single = await client.post("/api/v1/grades", headers=headers, json=grade)
+            batch = await client.post("/api/v1/grades/batch", headers=headers, json=[grade])
+    return single.json(), batch.json()["results"][0]["grade"]
+
+
+def test_batch_returns_the_stored_grade_like_single_create(settings):
+    single, batched = asyncio.run(create_grades(settings()))
+
+    assert batched["id"] != single["id"]
+    assert {**batched, "id": None} == {**single, "id": None}
+    assert batched["date"] == "2025-04-27T12:34:56"
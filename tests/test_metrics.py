@@ -0,0 +1,23 @@
+from sqlalchemy import text
+
+from services.database_engine import DatabaseEngine
+from services.metrics import Metrics
+
+
+def samples(metric) -> dict[str, float]:
+    return {name: value for name, labels, value in metric.samples() if "le" not in labels}
+
+
+def test_pool_metrics_survive_engine_dispose(tmp_path):
+    database_engine = DatabaseEngine(f"sqlite:///{tmp_path}/metrics.db")
+    metrics = Metrics()
+    metrics.instrument_engine(database_engine.engine, "sync")
+
+    for _ in range(2):
+        with database_engine.engine.connect() as connection:
+            connection.execute(text("select 1"))
+            assert samples(metrics.pool_checked_out) == {"db_pool_checked_out": 1}
+        database_engine.engine.dispose()
+
+    assert samples(metrics.pool_checked_out) == {"db_pool_checked_out": 0}
+    assert samples(metrics.pool_checkout_wait)["db_pool_checkout_wait_seconds_count"] == 2
@@ -0,0 +1,25 @@
+from sqlalchemy import func, select
+
+from constants.reaction_kind import ReactionKind
+from models.reaction_result import ReactionResult
+from services.database_engine import DatabaseEngine
+from services.reaction_knowledge_base import ReactionKnowledgeBase
+
+MODEL = "gpt-test"
+LONG_PROMPT = "Please describe what happens when " + " ".join(f"C{index}H{index}" for index in range(60))
+
+
+def test_answers_with_keys_longer_than_the_column_are_not_persisted(settings):
+    database_engine = DatabaseEngine(settings().DATABASE_URL)
+    database_engine.create_schema()
+    knowledge_base = ReactionKnowledgeBase()
+    assert len(knowledge_base.canonicalize(LONG_PROMPT)) > ReactionKnowledgeBase.MAX_FORMULA_LENGTH
+
+    with database_engine.SessionLocal() as db:
+        knowledge_base.store(db, ReactionKind.FULL, LONG_PROMPT, MODEL, "long")
+        knowledge_base.store_many(db, ReactionKind.EMPIRICAL, {LONG_PROMPT: "long", "H2 + O2": "water"}, MODEL)
+
+        assert knowledge_base.lookup(db, ReactionKind.FULL, LONG_PROMPT, MODEL) is None
+        assert knowledge_base.lookup_many(db, ReactionKind.EMPIRICAL, [LONG_PROMPT, "O2 + H2"], MODEL) == {"H2+O2": "water"}
+        assert db.scalar(select(func.count()).select_from(ReactionResult)) == 1
+    database_engine.engine.dispose()
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+from sqlalchemy import select, update
+
+from benchmarks.endpoint_benchmark import login
+from benchmarks.sqlite_dataset import seed
+from main import create_app
+from models.student import Student
+from models.teacher_data_version import TeacherDataVersion
+from services.database_engine import DatabaseEngine
+
+
+def session_versions(database_engine: DatabaseEngine) -> dict[int, int]:
+    with database_engine.SessionLocal() as db:
+        return dict(db.execute(select(TeacherDataVersion.teacher_id, TeacherDataVersion.sessions_version)).all())
+
+
+async def save_after_reassignment(settings) -> tuple[int, int, dict[int, int], dict[int, int]]:
+    database_engine = DatabaseEngine(settings.DATABASE_URL)
+    database_engine.create_schema()
+    dataset = seed(database_engine.engine, teachers=2, students_per_teacher=1, grades_per_student=1, sessions_per_student=1)
+    student_id = dataset["student_ids"][0]
+    with database_engine.SessionLocal() as db:
+        old_teacher_id = db.scalar(select(Student.assigned_teacher_id).where(Student.id == student_id))
+    new_teacher_id = next(teacher_id for teacher_id in dataset["teacher_ids"] if teacher_id != old_teacher_id)
+
+    app = create_app(settings)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = await login(client, student_id)
+            session = {"student_id": student_id, "length_minutes": 30, "reactions_total": 2}
+            assert (await client.post("/api/v1/sessions", headers=headers, json=session)).status_code == 200
+
+            with database_engine.SessionLocal() as db:
+                db.execute(update(Student).where(Student.id == student_id).values(assigned_teacher_id=new_teacher_id))
+                db.commit()
+            before = session_versions(database_engine)
+            assert (await client.post("/api/v1/sessions", headers=headers, json=session)).status_code == 200
+            after = session_versions(database_engine)
+    database_engine.engine.dispose()
+    return old_teacher_id, new_teacher_id, before, after
+
+
+def test_strict_session_bumps_the_current_teacher_version(settings):
+    old_teacher_id, new_teacher_id, before, after = asyncio.run(save_after_reassignment(settings(SESSION_COMMIT_MODE="strict")))
+
+    assert after.get(new_teacher_id, 0) == before.get(new_teacher_id, 0) + 1
+    assert after.get(old_teacher_id, 0) == before.get(old_teacher_id, 0)
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+from benchmarks.endpoint_benchmark import login
+from benchmarks.sqlite_dataset import seed
+from constants.session_commit_mode import SessionCommitMode
+from main import create_app
+from models.student_rollup import StudentRollup
+from models.study_session import StudySession
+from services.database_engine import DatabaseEngine
+from services.rollup_service import RollupService
+from services.session_write_buffer import SessionWriteBuffer
+
+STUDENTS = 5
+SESSIONS = 100
+
+
+async def post_sessions(settings) -> list[int]:
+    database_engine = DatabaseEngine(settings.DATABASE_URL)
+    database_engine.create_schema()
+    dataset = seed(
+        database_engine.engine,
+        teachers=1,
+        students_per_teacher=STUDENTS,
+        grades_per_student=1,
+        sessions_per_student=1,
+    )
+    database_engine.engine.dispose()
+
+    app = create_app(settings)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            student_ids = dataset["student_ids"]
+            headers = [await login(client, student_id) for student_id in student_ids]
+            responses = await asyncio.gather(*(
+                client.post(
+                    "/api/v1/sessions",
+                    headers=headers[index % STUDENTS],
+                    json={"student_id": student_ids[index % STUDENTS], "length_minutes": 30, "reactions_total": 2},
+                )
+                for index in range(SESSIONS)
+            ))
+    return [response.status_code for response in responses]
+
+
+@pytest.mark.parametrize("mode", [SessionCommitMode.WRITE_BEHIND, SessionCommitMode.GROUP])
+def test_buffered_sessions_survive_graceful_shutdown(settings, mode):
+    settings = settings(SESSION_COMMIT_MODE=mode.value, SESSION_FLUSH_INTERVAL_MS=1000)
+    statuses = asyncio.run(post_sessions(settings))
+
+    database_engine = DatabaseEngine(settings.DATABASE_URL)
+    database_engine.import_models()
+    with database_engine.SessionLocal() as db:
+        sessions = db.scalar(select(func.count()).select_from(StudySession))
+        rolled_up = db.scalar(select(func.sum(StudentRollup.sessions_count)))
+    database_engine.engine.dispose()
+
+    assert statuses == [200] * SESSIONS
+    assert sessions == STUDENTS + SESSIONS
+    assert rolled_up == SESSIONS
+
+
+def test_failed_session_is_logged(tmp_path, caplog):
+    database_engine = DatabaseEngine(f"sqlite:///{tmp_path}/buffer.db")
+    database_engine.create_schema()
+    dataset = seed(database_engine.engine, teachers=1, students_per_teacher=1, grades_per_student=1, sessions_per_student=1)
+    buffer = SessionWriteBuffer(database_engine.SessionLocal, RollupService(), flush_interval_ms=1000)
+    row = {"date": datetime(2025, 9, 1), "student_id": dataset["student_ids"][0], "length_minutes": 30, "reactions_total": 2}
+
+    with caplog.at_level(logging.ERROR, logger="services.session_write_buffer"):
+        saved = buffer.submit(row)
+        failed = buffer.submit({**row, "length_minutes": None})
+        buffer.stop()
+
+    assert saved.result() is not None
+    assert failed.exception() is not None
+    assert buffer.rows_failed == 1
+    assert "length_minutes" in caplog.text
+    with database_engine.SessionLocal() as db:
+        assert db.get(StudySession, saved.result()).student_id == row["student_id"]
+        assert db.scalar(select(func.count()).select_from(StudentRollup)) == 1
+    database_engine.engine.dispose()
@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.endpoint_benchmark import login
+from benchmarks.sqlite_dataset import seed
+from main import create_app
+from services.database_engine import DatabaseEngine
+
+STUDENTS = 10
+
+
+async def list_sessions(settings, sessions_per_student: int) -> tuple[int, int]:
+    database_engine = DatabaseEngine(settings.DATABASE_URL)
+    database_engine.create_schema()
+    dataset = seed(
+        database_engine.engine,
+        teachers=1,
+        students_per_teacher=STUDENTS,
+        grades_per_student=1,
+        sessions_per_student=sessions_per_student,
+    )
+    database_engine.engine.dispose()
+
+    app = create_app(settings)
+    statements = []
+
+    def count(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = await login(client, dataset["teacher_ids"][0])
+            engines = (app.state.database_engine.engine, app.state.database_engine.async_engine.sync_engine)
+            for engine in engines:
+                event.listen(engine, "before_cursor_execute", count)
+            response = await client.get("/api/v1/sessions", params={"limit": 1000}, headers=headers)
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    return len(response.json()["items"]), len(statements)
+
+
+def test_session_list_statement_count_does_not_grow_with_rows(settings):
+    rows, statements = asyncio.run(list_sessions(settings("small"), 2))
+    more_rows, more_statements = asyncio.run(list_sessions(settings("large"), 20))
+
+    assert rows == 2 * STUDENTS
+    assert more_rows == 10 * rows
+    assert more_statements == statements